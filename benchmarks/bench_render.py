@@ -0,0 +1,92 @@
+"""Benchmark suite of the render pipeline
+
+Covers construction of elements, serialization of wide and deep trees, class names
+of styles, rendering of Head, the full Page.render path inside a request context and
+the `?css=1`/`?js=1` asset responses. Results are written by pyperf as JSON, so runs of
+different versions can be compared.
+
+Usage:
+    pip install pyperf
+    python benchmarks/bench_render.py -o baseline.json
+    python benchmarks/bench_render.py -o changes.json
+    python -m pyperf compare_to baseline.json changes.json --table
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyperf
+from flask import Flask, request
+from flask_html import Page, Head
+from flask_html.core import Style, style_cache, style_class
+from flask_html.tags import Body, Button, Div, Li, P, Ul, A
+from deep_tree import build_tree
+
+app = Flask(__name__)
+app.config["SECRET_KEY"] = "benchmark"
+
+
+def build_page_body(page, items=200):
+    return Body(page, elements=[
+        Div(classes=['container'], styles=Style(padding="10px"), elements=[
+            Ul(classes=['nav'], elements=[
+                Li(classes=['nav-item'], styles=Style(margin="{}px".format(x % 10)), elements=[
+                    A('/item/{}'.format(x), classes=['nav-link'], elements=['Item {}'.format(x)])
+                ]) for x in range(items)
+            ]),
+            P(elements=['Text']),
+            Button('Button', classes=['btn']).on('click', "alert('click')")
+        ])
+    ])
+
+
+def bench_construction(items):
+    with app.test_request_context("/"):
+        page = Page(Head('Title'))
+        build_page_body(page, items)
+
+
+def bench_style_class_cold(count):
+    with app.app_context():
+        for x in range(count):
+            style_cache.clear()
+            style_class("margin:{}px;\n".format(x))
+
+
+def bench_style_class_cached(count):
+    with app.app_context():
+        style_class("color:red;\n")
+        for x in range(count):
+            style_class("color:red;\n")
+
+
+def bench_head(styles):
+    with app.test_request_context("/"):
+        Head('Title', styles, ['https://example.com/script.js'], [{"name": "description", "content": "page"}]).render()
+
+
+def bench_page(path):
+    with app.test_request_context(path):
+        page = Page(Head('Title', ['https://example.com/style.css']))
+        body = build_page_body(page)
+        return page.render(body, request)
+
+
+def main():
+    runner = pyperf.Runner()
+    wide = Div(elements=[P(elements=['Paragraph {}'.format(x)], classes=['text']) for x in range(10000)])
+    deep = build_tree(30, 10000)
+    runner.bench_func("construct_200_items", bench_construction, 200)
+    runner.bench_func("render_wide_10k", wide.render)
+    runner.bench_func("render_deep_30x10k", deep.render)
+    runner.bench_func("style_class_cold_100", bench_style_class_cold, 100)
+    runner.bench_func("style_class_cached_1000", bench_style_class_cached, 1000)
+    runner.bench_func("head_render", bench_head, ['https://example.com/style.css'])
+    runner.bench_func("page_render", bench_page, "/")
+    runner.bench_func("page_render_css", bench_page, "/?css=1")
+    runner.bench_func("page_render_js", bench_page, "/?js=1")
+
+
+if __name__ == "__main__":
+    main()
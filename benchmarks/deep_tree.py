@@ -0,0 +1,69 @@
+"""Serializer benchmark on deep trees
+
+Compares the single pass serializer of Item.render with the previous recursive
+implementation, which concatenated children with += at every level.
+
+Usage:
+    python benchmarks/deep_tree.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_html.core import Item
+from flask_html.tags import Div, Span
+
+
+def recursive_render(item):
+    """Previous implementation of Item.render"""
+    _id = ""
+    if item._Item__id:
+        _id = "id='{}'".format(item._Item__id)
+    _classes = ""
+    if len(item._Item__classes) > 0:
+        _classes = "class='"
+        for _class in item._Item__classes:
+            _classes += _class + " "
+        _classes = _classes.rstrip(" ")
+        _classes = _classes + "'"
+    _props = ""
+    if len(item._Item__props) > 0:
+        for key, value in item._Item__props.items():
+            _props += "{}='{}' ".format(key, value)
+        _props = _props.rstrip(" ")
+    _cnt = ""
+    for child in item._Item__elements:
+        _cnt += recursive_render(child) if isinstance(child, Item) else str(child)
+    return "<{tag} {classes} {id} {props}>{content}</{tag}>".format(tag=item._Item__tag, classes=_classes, id=_id, content=_cnt, props=_props)
+
+
+def build_tree(depth, nodes):
+    """Build a tree of given depth with roughly `nodes` elements
+
+    Every level holds a chain of nested Div elements, leaves are spread between chains.
+    """
+    chains = max(1, nodes // (depth + 1))
+    branches = []
+    for x in range(chains):
+        node = Span('text {}'.format(x), classes=['leaf'])
+        for level in range(depth):
+            node = Div(classes=['level-{}'.format(level)], elements=[node, ' '])
+        branches.append(node)
+    return Div(id='root', elements=branches)
+
+
+def main():
+    print("{:>6} {:>8} {:>12} {:>12} {:>8}".format("depth", "nodes", "recursive", "iterative", "speedup"))
+    for depth in (10, 20, 30):
+        for nodes in (10000, 50000):
+            tree = build_tree(depth, nodes)
+            assert recursive_render(tree) == tree.render()
+            old = min(timeit.repeat(lambda: recursive_render(tree), number=3, repeat=3)) / 3
+            new = min(timeit.repeat(tree.render, number=3, repeat=3)) / 3
+            print("{:>6} {:>8} {:>10.1f}ms {:>10.1f}ms {:>7.2f}x".format(depth, nodes, old * 1000, new * 1000, old / new))
+
+
+if __name__ == "__main__":
+    main()
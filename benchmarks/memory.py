@@ -0,0 +1,39 @@
+"""Memory used by element trees
+
+Builds a table of 100k Td cells under tracemalloc and reports memory per node.
+Run it on two checkouts to compare layouts of Item.
+
+Usage:
+    python benchmarks/memory.py
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_html.tags import Table, Td, Tr
+
+ROWS = 10000
+COLUMNS = 10
+
+
+def build_table():
+    return Table(elements=[
+        Tr(elements=[Td("cell") for x in range(COLUMNS)]) for y in range(ROWS)
+    ])
+
+
+def main():
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = build_table()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    nodes = ROWS * COLUMNS + ROWS + 1
+    print("{} nodes: {:.1f} MiB, {:.0f} bytes per node".format(nodes, (after - before) / 2 ** 20, (after - before) / nodes))
+    return table
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Memory of style and js registries across renders
+
+Renders a styled page with listeners 100k times in one process, every time in a request
+of its own, and reports memory allocated by flask_html after every 10k renders. With per-page
+registries the numbers stay flat instead of growing with the number of requests,
+tests/test_registry.py asserts it.
+
+Usage:
+    python benchmarks/registry_memory.py
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, request
+from flask_html import Page, Head
+from flask_html.core import Style
+from flask_html.tags import Body, Button, Div
+
+RENDERS = 100000
+STEP = 10000
+
+
+def render(x):
+    page = Page(Head('Title'))
+    body = Body(page, elements=[
+        Div(styles=Style(padding="{}px".format(x % 50)), elements=[
+            Button('Button', styles=Style(color="red")).on("click", "alert({})".format(x % 50))
+        ])
+    ])
+    return page.render(body, request)
+
+
+app = Flask(__name__)
+
+
+def main():
+    with app.test_request_context("/"):
+        render(0)
+    tracemalloc.start()
+    gc.collect()
+    start = tracemalloc.get_traced_memory()[0]
+    for x in range(1, RENDERS + 1):
+        with app.test_request_context("/"):
+            render(x)
+        if x % STEP == 0:
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            print("{:>7} renders: {:>8} bytes over start".format(x, current - start))
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from flask import Flask
-from flask_html import Page, Head
+from flask_html import Page, Head, FlaskHTML
 
 def create_app():
     
     app = Flask(__name__)
+    FlaskHTML(app)
     from .blueprint import pages
     app.register_blueprint(pages)
     return app
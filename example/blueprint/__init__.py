@@ -1,14 +1,15 @@
 from flask import Blueprint, request
-from flask_html import Page, Head
+from flask_html import Page, HeadTemplate
 from flask_html.core import Item
 from flask_html.tags import H1, P, Body, Button, Div, Footer, Form, Header, Img, Input, Li, Section, Small, Ul, A
 pages = Blueprint("pages", __name__, url_prefix="/")
 
+HEAD = HeadTemplate(['https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/css/bootstrap.min.css'],['https://code.jquery.com/jquery-3.6.1.min.js','https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/js/bootstrap.bundle.min.js'], [{"meta_property": "value"}])
+
 
 @pages.route("/")
 def index():
-    head = Head('Title', ['https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/css/bootstrap.min.css'],['https://code.jquery.com/jquery-3.6.1.min.js','https://cdn.jsdelivr.net/npm/bootstrap@5.2.2/dist/js/bootstrap.bundle.min.js'], [{"meta_property": "value"}])
-    page = Page(head)
+    page = Page(HEAD.head('Title'))
     menu_items = {
         "Home": "/",
         "About": "/about",
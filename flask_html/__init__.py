@@ -1,22 +1,74 @@
+from hashlib import sha1
+from itertools import islice
 from typing import Dict, List
-from flask import request, make_response
+from flask import current_app, g, has_request_context, request, make_response
+from .assets import FlaskHTML
+from .signals import after_render, before_render
+from .utils import Registry
 
-class Head:
-    def __init__(self, title: str, styles : List[str] = [], scripts : List[str] = [], metas : List[Dict[str, str]] = []):
-        """Head element for HTML page
+_STYLE_LINK = """
+            <link rel="stylesheet" href="{}">
+            """
+_SCRIPT_TAG = """
+            <script src="{}"></script>
+            """
+_DEFER_SCRIPT_TAG = """
+            <script src="{}" defer></script>
+            """
+_STYLE_BLOCK = """
+            <style>{}</style>
+            """
+_MIN_STYLE_LINK = '<link rel="stylesheet" href="{}">'
+_MIN_STYLE_BLOCK = '<style>{}</style>'
+_MIN_SCRIPT_TAG = '<script src="{}"></script>'
+_MIN_DEFER_SCRIPT_TAG = '<script src="{}" defer></script>'
+
+_JS_LOADERS = {
+    "jquery": ("$(document).ready(function(){", "})"),
+    "vanilla": (
+        "(function(){var ready=function(){",
+        "};if(document.readyState==='loading'){document.addEventListener('DOMContentLoaded',ready)}else{ready()}})()"
+    ),
+    "defer": ("(function(){", "})()"),
+}
+
+
+def _buffered(chunks, size: int):
+    """Join chunks into strings of at least size characters, only the last one may be shorter"""
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+class HeadTemplate:
+    __slots__ = ("__start", "__styles", "__scripts", "__min_start", "__min_styles", "__min_scripts")
+
+    def __init__(self, styles : List[str] = (), scripts : List[str] = (), metas : List[Dict[str, str]] = ()):
+        """Immutable head of HTML pages, declared once and shared by requests
+
+        Metas, styles and scripts are rendered when the template is created, in regular and
+        minified form, per request only the title and links to generated assets are added.
+
+        Example:
+            HEAD = HeadTemplate(['style.css'], ['script.js'])
+
+            @app.route('/')
+            def index():
+                page = Page(HEAD.head('Title'))
 
         Args:
-            title (str): Title of page
-            styles (List[str], optional): List of style sources. Defaults to [].
-            scripts (List[str], optional): List of js sources. Defaults to [].
-            metas (List[Dict[str, str]], optional): List of meta objects. Defaults to [].
+            styles (List[str], optional): List of style sources. Defaults to ().
+            scripts (List[str], optional): List of js sources. Defaults to ().
+            metas (List[Dict[str, str]], optional): List of meta objects. Defaults to ().
         """
-        if "?" in request.url:
-            styles.append(request.url + "&css=1")
-            scripts.append(request.url + "&js=1")
-        else:
-            styles.append(request.url + "?css=1")
-            scripts.append(request.url + "?js=1")
         _cont = """
         <head>
         <meta charset="UTF-8">
@@ -28,29 +80,91 @@ class Head:
             for key, value in meta.items():
                 _cont += "{}='{}' ".format(key, value)
             _cont += """>"""
-        _cont += """<title>{title}</title>
-        """.format(title=title)
-        for style in styles:
-            _cont += """
-            <link rel="stylesheet" href="{style}">
-            """.format(style=style)
-        for script in scripts:
-            _cont += """
-            <script src="{script}"></script>
-            """.format(script=script)
-        
-        
-        self.content = _cont
+        self.__start = _cont
+        self.__styles = "".join(_STYLE_LINK.format(style) for style in styles)
+        self.__scripts = "".join(_SCRIPT_TAG.format(script) for script in scripts)
+        _min = '<head><meta charset="UTF-8"><meta http-equiv="X-UA-Compatible" content="IE=edge"><meta name="viewport" content="width=device-width, initial-scale=1.0">'
+        for meta in metas:
+            _min += "<meta " + " ".join("{}='{}'".format(key, value) for key, value in meta.items()) + ">"
+        self.__min_start = _min
+        self.__min_styles = "".join(_MIN_STYLE_LINK.format(style) for style in styles)
+        self.__min_scripts = "".join(_MIN_SCRIPT_TAG.format(script) for script in scripts)
+
+    def head(self, title: str):
+        """Head of page with given title"""
+        return Head(title, template=self)
+
+    def render(self, title: str, styles: List[str] = (), scripts: List[str] = (), minify: bool = False, extra: str = "", defer: bool = False):
+        """Render head
+
+        Args:
+            title (str): Title of page
+            styles (List[str], optional): Sources of generated styles. Defaults to ().
+            scripts (List[str], optional): Sources of generated js. Defaults to ().
+            minify (bool, optional): Render without indentation and newlines. Defaults to False.
+            extra (str, optional): Markup added at the end of head. Defaults to "".
+            defer (bool, optional): Load generated js with `defer` attribute. Defaults to False.
+        """
+        if minify:
+            return "".join([
+                self.__min_start,
+                "<title>{}</title>".format(title),
+                self.__min_styles,
+                "".join(_MIN_STYLE_LINK.format(style) for style in styles),
+                self.__min_scripts,
+                "".join((_MIN_DEFER_SCRIPT_TAG if defer else _MIN_SCRIPT_TAG).format(script) for script in scripts),
+                extra,
+                "</head>"
+            ])
+        return "".join([
+            self.__start,
+            """<title>{title}</title>
+        """.format(title=title),
+            self.__styles,
+            "".join(_STYLE_LINK.format(style) for style in styles),
+            self.__scripts,
+            "".join((_DEFER_SCRIPT_TAG if defer else _SCRIPT_TAG).format(script) for script in scripts),
+            extra,
+            """</head>"""
+        ])
+
+
+class Head:
+    def __init__(self, title: str, styles : List[str] = [], scripts : List[str] = [], metas : List[Dict[str, str]] = [], template: HeadTemplate = None):
+        """Head element for HTML page
+
+        Args:
+            title (str): Title of page
+            styles (List[str], optional): List of style sources. Defaults to [].
+            scripts (List[str], optional): List of js sources. Defaults to [].
+            metas (List[Dict[str, str]], optional): List of meta objects. Defaults to [].
+            template (HeadTemplate, optional): Pre-rendered head used instead of styles, scripts and metas. Defaults to None.
+        """
+        self.title = title
+        self.template = template if template is not None else HeadTemplate(styles, scripts, metas)
     
     def __str__(self):
-        return self.content
+        return self.render()
     
     def __repr__(self):
-        return self.content
+        return self.render()
     
-    def render(self):
-        self.content += """</head>"""
-        return self.content
+    def render(self, styles: List[str] = None, scripts: List[str] = None, minify: bool = False, extra: str = "", defer: bool = False):
+        """Render head with links to generated assets of page
+
+        Args:
+            styles (List[str], optional): Sources of generated styles. Defaults to `?css=1` link of current URL.
+            scripts (List[str], optional): Sources of generated js. Defaults to `?js=1` link of current URL.
+            minify (bool, optional): Render without indentation and newlines. Defaults to False.
+            extra (str, optional): Markup added at the end of head. Defaults to "".
+            defer (bool, optional): Load generated js with `defer` attribute. Defaults to False.
+        """
+        url = request.url + ("&" if "?" in request.url else "?")
+        if styles is None:
+            styles = [url + "css=1"]
+        if scripts is None:
+            scripts = [url + "js=1"]
+        return self.template.render(self.title, styles or (), scripts or (), minify, extra, defer)
 
 
 class Page:
@@ -63,43 +177,294 @@ class Page:
         """        
         self.head = head
         self.lang = lang
-    custom_classes = {}
-    custom_js = ""
-    def render(self, content, request):
+        size = current_app.config.get("FLASK_HTML_REGISTRY_SIZE", 10000)
+        self.custom_classes = Registry(size)
+        self.custom_js = Registry(size)
+        self.minify = current_app.config.get("FLASK_HTML_MINIFY", False)
+        self.inline_css = current_app.config.get("FLASK_HTML_INLINE_CSS_SIZE", 0)
+        self.events = current_app.config.get("FLASK_HTML_EVENTS", "direct")
+        self.js_loader = current_app.config.get("FLASK_HTML_JS_LOADER", "jquery")
+        self.stream_chunk_size = current_app.config.get("FLASK_HTML_STREAM_CHUNK_SIZE", 16384)
+        self.parallel_blocks = []
+        self.head_extra = []
+
+    def render(self, content, request, executor = None):
+        """Render page, or its generated CSS or js for `?css=1` and `?js=1` requests
+
+        The body is rendered before the head, so the head links or inlines all styles and
+        js of the page.
+
+        Args:
+            content (Item): Body element
+            request (Request): Current request
+            executor (Executor, optional): concurrent.futures executor which renders child elements of body and ParallelBlock elements in separate jobs. Defaults to None.
+        """
+        self.build_blocks(executor)
+        state = current_app.extensions.get("flask_html")
+        compressor = state.compressor if state is not None else None
         css = request.args.get("css")
         _js = request.args.get("js")
+        if css or _js:
+            for _ in self.__body(content, executor):
+                pass
         if css:
-            res = ""
-            for key, value in self.custom_classes.items():
-                _st = """
-                    .{hash_code} {{
-                    {styles}
-                    }}
-                    """.format(hash_code = key, styles=value)
-                res += _st
-            resp = make_response(res)
+            if compressor is not None:
+                return compressor.response(self.render_css(), request, "text/css")
+            resp = make_response(self.render_css())
             resp.headers['Content-Type'] = 'text/css ;charset=utf-8'
             return resp
         if _js:
-            res = """
-            $(document).ready(function(){{ {js} }})
-            """.format(js=self.custom_js)
-            resp = make_response(res)
+            if compressor is not None:
+                return compressor.response(self.render_js(), request, "text/javascript")
+            resp = make_response(self.render_js())
             resp.headers['Content-Type'] = 'text/javascript ;charset=utf-8'
             return resp
-        content = """
+        html = self.__html(content, executor)
+        if compressor is not None:
+            return compressor.response(html, request)
+        return html
+
+    def response(self, content, request, version: object = None, executor = None):
+        """Render page as response with strong ETag, `If-None-Match` requests of unchanged page get 304
+
+        The ETag is a digest of rendered page. When version is given, the ETag is derived from it
+        instead and a matching request is answered before the page is serialized, so version
+        must change whenever the page, its styles or js change.
+
+        Example:
+            return page.response(body, request, version=(post.id, post.updated_at))
+
+        Args:
+            content (Item): Body element
+            request (Request): Current request
+            version (object, optional): Version or cache key of page. Defaults to None.
+            executor (Executor, optional): concurrent.futures executor which renders child elements of body and ParallelBlock elements in separate jobs. Defaults to None.
+        """
+        if request.args.get("css") or request.args.get("js"):
+            return make_response(self.render(content, request, executor))
+        etag = None
+        if version is not None:
+            etag = "v" + sha1(repr(version).encode()).hexdigest()[:20]
+            for tag in (etag, etag + ".br", etag + ".gzip"):
+                if request.if_none_match.contains(tag):
+                    resp = current_app.response_class(status=304)
+                    resp.set_etag(tag)
+                    return resp
+        self.build_blocks(executor)
+        html = self.__html(content, executor)
+        if etag is None:
+            etag = sha1(html.encode()).hexdigest()[:20]
+        state = current_app.extensions.get("flask_html")
+        if state is not None and state.compressor is not None:
+            resp = state.compressor.response(html, request)
+        else:
+            resp = current_app.response_class(html, mimetype="text/html")
+        resp.set_etag(etag if resp.content_encoding is None else etag + "." + resp.content_encoding)
+        return resp.make_conditional(request)
+
+    async def render_async(self, content, request, timeout: float = None, fallback: object = ""):
+        """Render page whose elements contain awaitables
+
+        Coroutines and futures placed among child elements (directly or wrapped in
+        flask_html.core.Await) are awaited concurrently before the page is rendered.
+
+        Args:
+            content (Item): Body element
+            request (Request): Current request
+            timeout (float, optional): Timeout in seconds of every awaitable not wrapped in Await. Defaults to None.
+            fallback (object, optional): Content used when an awaitable times out. Defaults to "".
+        """
+        if hasattr(content, "resolve_async"):
+            await content.resolve_async(timeout, fallback)
+        return self.render(content, request)
+
+    def patch(self, content, request):
+        """Render page, or only the changes since the previous render for the same browser
+
+        The first response loads a small runtime which sends its client token with
+        `flaskHtml.refresh()`; such requests get a JSON list of DOM operations computed
+        against the fingerprint of the previous render instead of the whole page.
+        Elements are matched by id, so give ids to the parts of page which change.
+        Requires FlaskHTML extension, otherwise the page is rendered as with Page.render.
+
+        Args:
+            content (Item): Body element
+            request (Request): Current request
+        """
+        from .diff import render_patch
+        return render_patch(self, content, request)
+
+    def render_css(self):
+        return self.__css(self.custom_classes.items())
+
+    def __css(self, rules):
+        if self.minify:
+            return "".join(".{}{{{}}}".format(key, value.replace("\n", "")) for key, value in rules)
+        res = ""
+        for key, value in rules:
+            _st = """
+                    .{hash_code} {{
+                    {styles}
+                    }}
+                    """.format(hash_code = key, styles=value)
+            res += _st
+        return res
+
+    def render_js(self):
+        """Render generated js wrapped by FLASK_HTML_JS_LOADER
+
+        "jquery" runs it in `$(document).ready`, so jQuery must be loaded by head scripts,
+        "vanilla" waits for `DOMContentLoaded` unless the document is already parsed and
+        "defer" runs it at once, the script tag is deferred until the document is parsed.
+        """
+        return self.__js(self.custom_js)
+
+    def __js(self, scripts):
+        js = "".join(scripts)
+        if self.events == "delegated" and js:
+            from .core import DELEGATION_JS
+            js = DELEGATION_JS + js
+        start, end = _JS_LOADERS[self.js_loader]
+        if self.minify:
+            return start + js + end
+        return """
+            {start} {js} {end}
+            """.format(start=start, js=js, end=end)
+
+    def render_head(self):
+        """Render head of page
+
+        When FlaskHTML extension is initialised, generated styles and js are stored as
+        content addressed assets and linked from head, otherwise `?css=1` and `?js=1`
+        links of current URL are used. Generated CSS up to FLASK_HTML_INLINE_CSS_SIZE
+        bytes is inlined into a style block instead, saving a request before first paint.
+        """
+        state = current_app.extensions.get("flask_html")
+        extra = "".join(self.head_extra)
+        styles = None
+        if self.custom_classes and self.inline_css:
+            css = self.render_css()
+            if len(css) <= self.inline_css:
+                extra = (_MIN_STYLE_BLOCK if self.minify else _STYLE_BLOCK).format(css) + extra
+                styles = []
+        if state is None:
+            return self.head.render(styles, None, self.minify, extra, self.js_loader == "defer")
+        if styles is None:
+            styles = [state.add_asset(self.render_css(), "css")] if self.custom_classes else []
+        scripts = [state.add_asset(self.render_js(), "js")] if self.custom_js else []
+        return self.head.render(styles, scripts, self.minify, extra, self.js_loader == "defer")
+
+    def build_blocks(self, executor = None):
+        """Start building ParallelBlock elements created in current request and added to `parallel_blocks`
+
+        Their styles and js are registered in document order when the body is rendered.
+        Called before every render, it also drops CachedFragment entries loaded by previous renders.
+
+        Args:
+            executor (Executor, optional): concurrent.futures executor which builds blocks. Defaults to None.
+        """
+        blocks = self.parallel_blocks
+        if has_request_context():
+            blocks = blocks + g.pop("_flask_html_blocks", [])
+            g.pop("_flask_html_fragments", None)
+        self.parallel_blocks = []
+        for block in dict.fromkeys(blocks):
+            block.start(executor, self.minify)
+
+    def stream(self, content, executor = None):
+        """Render page as a stream of HTML chunks
+
+        The body is yielded as soon as it is rendered, so the response can be sent without
+        building the whole document. Tags and text are joined into chunks of
+        FLASK_HTML_STREAM_CHUNK_SIZE characters, so the server does not write every tag separately.
+        The doctype and head are sent first, before any element of body is rendered. Styles and js
+        are collected while the body is rendered: with FlaskHTML extension rules first used by a
+        chunk are inlined in a style block right before it and js is loaded at the end of body,
+        without it the head links `?css=1` and `?js=1` of the current URL.
+
+        Example:
+            return Response(stream_with_context(page.stream(body)), mimetype="text/html")
+
+        Args:
+            content (Item): Body element
+            executor (Executor, optional): concurrent.futures executor which renders child elements of body and ParallelBlock elements in separate jobs. Defaults to None.
+
+        Yields:
+            str: Chunks of HTML page
+        """
+        self.build_blocks(executor)
+        before_render.send(self, content=content)
+        yield self.__opening(self.render_head())
+        chunks = _buffered(self.__body(content, executor), self.stream_chunk_size)
+        yield from self.__streamed_body(chunks, len(self.custom_classes), len(self.custom_js))
+        after_render.send(self, content=content)
+
+    def __streamed_body(self, chunks, styles: int, scripts: int):
+        state = current_app.extensions.get("flask_html")
+        if state is None:
+            # `?css=1` and `?js=1` links of head render the page again and collect everything
+            yield from chunks
+            yield self.__closing()
+            return
+        for chunk in chunks:
+            if len(self.custom_classes) > styles:
+                css = self.__css(islice(self.custom_classes.items(), styles, None))
+                chunk = (_MIN_STYLE_BLOCK if self.minify else _STYLE_BLOCK).format(css) + chunk
+                styles = len(self.custom_classes)
+            yield chunk
+        end = self.__closing()
+        if len(self.custom_js) > scripts:
+            if self.js_loader == "defer":
+                tag = _MIN_DEFER_SCRIPT_TAG if self.minify else _DEFER_SCRIPT_TAG
+            else:
+                tag = _MIN_SCRIPT_TAG if self.minify else _SCRIPT_TAG
+            end = tag.format(state.add_asset(self.__js(islice(self.custom_js, scripts, None)), "js")) + end
+        yield end
+
+    def __html(self, content, executor = None):
+        before_render.send(self, content=content)
+        body = list(self.__body(content, executor))
+        html = "".join(self.__document(self.render_head(), body))
+        after_render.send(self, content=content)
+        return html
+
+    def __body(self, content, executor = None):
+        from .profiling import active_profiler
+        profiler = active_profiler()
+        if profiler is not None and hasattr(content, "_parts"):
+            yield from profiler.iter_render(content, self.minify, self)
+        elif executor is not None and hasattr(content, "iter_render_parallel"):
+            yield from content.iter_render_parallel(executor, self.minify, self)
+        elif hasattr(content, "iter_render"):
+            yield from content.iter_render(self.minify, self)
+        else:
+            yield str(content)
+
+    def __document(self, head: str, body):
+        yield self.__opening(head)
+        yield from body
+        yield self.__closing()
+
+    def __opening(self, head: str) -> str:
+        if self.minify:
+            return '<!DOCTYPE html><html lang="{lang}">{head}<body>'.format(lang=self.lang, head=head)
+        return """
             <!DOCTYPE html>
                 <html lang="{lang}">
-                {head}
+                """.format(lang=self.lang) + head + """
                 <body>
-                {content}
+                """
+
+    def __closing(self) -> str:
+        if self.minify:
+            return "</body></html>"
+        return """
                 </body>
                 </html>
-            """.format(lang=self.lang, head = self.head.render(), content=str(content))
-        return content
+            """
     
     def register_style(self, hash_code: str, style: str):
-        self.custom_classes[hash_code] = style
+        self.custom_classes.add(hash_code, style)
     
     def register_js(self, js: str):
-        self.custom_js += js
\ No newline at end of file
+        self.custom_js.add(js)
\ No newline at end of file
@@ -0,0 +1,155 @@
+import os
+import time
+from hashlib import sha256
+from flask import Blueprint, abort, current_app, request, url_for
+from .cache import create_asset_store, create_fragment_cache
+from .compress import Compressor
+from .utils import LRUCache
+
+_RECHECK = 60
+"""Seconds after which add_asset checks again that an asset it stored is still in the store"""
+
+MIMETYPES = {
+    "css": "text/css",
+    "js": "text/javascript",
+}
+
+assets = Blueprint("flask_html", __name__)
+
+
+@assets.route("/runtime.js")
+def runtime():
+    from .diff import RUNTIME
+    state = current_app.extensions["flask_html"]
+    resp = current_app.response_class(RUNTIME, mimetype=MIMETYPES["js"])
+    resp.set_etag(sha256(RUNTIME.encode()).hexdigest()[:20])
+    resp.cache_control.public = True
+    resp.cache_control.max_age = state.max_age
+    return resp.make_conditional(request)
+
+
+@assets.route("/<digest>.<ext>")
+def asset(digest: str, ext: str):
+    state = current_app.extensions["flask_html"]
+    if ext not in MIMETYPES:
+        abort(404)
+    content = state.assets.get("asset:{}.{}".format(digest, ext))
+    if content is None:
+        abort(404)
+    if state.compressor is not None:
+        resp = state.compressor.response(content, request, MIMETYPES[ext], (digest, ext), state.compressor.asset_cache)
+    else:
+        resp = current_app.response_class(content, mimetype=MIMETYPES[ext])
+    resp.set_etag(digest if resp.content_encoding is None else digest + "." + resp.content_encoding)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = state.max_age
+    resp.cache_control.immutable = True
+    return resp.make_conditional(request)
+
+
+class FlaskHTML:
+    def __init__(self, app=None):
+        """Flask extension which serves generated CSS and JS of pages
+
+        Styles and scripts registered while a page is rendered are stored under the
+        digest of their content and served from `/_flask_html/<digest>.css` and
+        `/_flask_html/<digest>.js`, so browsers load them without running the view again.
+        With the filesystem store or a shared FragmentCache any worker process answers
+        links of pages rendered by another one.
+
+        Config:
+            FLASK_HTML_URL_PREFIX (str): Prefix of asset routes. Defaults to "/_flask_html".
+            FLASK_HTML_ASSET_STORE (str | FragmentCache): Store of assets, "memory", "filesystem" or instance. Defaults to "memory".
+            FLASK_HTML_ASSET_DIR (str): Directory of filesystem store. Defaults to "flask_html_assets" in instance folder of app.
+            FLASK_HTML_ASSET_CACHE_SIZE (int): Maximum number of stored assets. Defaults to 1024.
+            FLASK_HTML_ASSET_MAX_AGE (int): Cache-Control max-age of assets in seconds. Defaults to one year.
+            FLASK_HTML_STYLE_CACHE_SIZE (int): Maximum number of cached class names of styles. Defaults to 4096.
+            FLASK_HTML_FRAGMENT_CACHE (str | FragmentCache): Backend of CachedFragment, "memory", "filesystem" or instance. Defaults to "memory".
+            FLASK_HTML_FRAGMENT_CACHE_SIZE (int): Maximum number of cached fragments. Defaults to 1024.
+            FLASK_HTML_FRAGMENT_CACHE_DIR (str): Directory of filesystem backend. Defaults to temp directory.
+            FLASK_HTML_MINIFY (bool): Render compact HTML, CSS and js. Defaults to False.
+            FLASK_HTML_INLINE_CSS_SIZE (int): Generated CSS up to this size in bytes is inlined into head. Defaults to 0, never inlined.
+            FLASK_HTML_ATOMIC_CSS (bool): Generate a class per CSS declaration instead of a class per Style. Defaults to False.
+            FLASK_HTML_EVENTS (str): "direct" listener per element or "delegated" listener per event type. Defaults to "direct".
+            FLASK_HTML_JS_LOADER (str): Wrapper of generated js, "jquery" ready callback, "vanilla" DOMContentLoaded listener or "defer" script. Defaults to "jquery".
+            FLASK_HTML_COMPRESS (bool): Compress pages and assets with gzip or brotli. Defaults to False.
+            FLASK_HTML_COMPRESS_LEVEL (int): Gzip compression level. Defaults to 6.
+            FLASK_HTML_COMPRESS_BROTLI_QUALITY (int): Brotli quality. Defaults to 5.
+            FLASK_HTML_COMPRESS_MIN_SIZE (int): Minimum size of compressed bodies in bytes. Defaults to 500.
+            FLASK_HTML_COMPRESS_CACHE_SIZE (int): Maximum number of cached compressed pages. Defaults to 256.
+            FLASK_HTML_STREAM_CHUNK_SIZE (int): Minimum size in characters of chunks of Page.stream. Defaults to 16384.
+            FLASK_HTML_PATCH_CACHE_SIZE (int): Maximum number of fingerprints of rendered pages kept for Page.patch. Defaults to 1024.
+
+        Args:
+            app (Flask, optional): Flask application. Defaults to None.
+        """
+        self.assets = None
+        self.max_age = None
+        self.fragment_cache = None
+        self.compressor = None
+        self.snapshots = None
+        self.__stored = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("FLASK_HTML_URL_PREFIX", "/_flask_html")
+        app.config.setdefault("FLASK_HTML_ASSET_STORE", "memory")
+        app.config.setdefault("FLASK_HTML_ASSET_DIR", os.path.join(app.instance_path, "flask_html_assets"))
+        app.config.setdefault("FLASK_HTML_ASSET_CACHE_SIZE", 1024)
+        app.config.setdefault("FLASK_HTML_ASSET_MAX_AGE", 31536000)
+        app.config.setdefault("FLASK_HTML_STYLE_CACHE_SIZE", 4096)
+        app.config.setdefault("FLASK_HTML_MINIFY", False)
+        app.config.setdefault("FLASK_HTML_EVENTS", "direct")
+        app.config.setdefault("FLASK_HTML_JS_LOADER", "jquery")
+        app.config.setdefault("FLASK_HTML_ATOMIC_CSS", False)
+        app.config.setdefault("FLASK_HTML_INLINE_CSS_SIZE", 0)
+        app.config.setdefault("FLASK_HTML_COMPRESS", False)
+        app.config.setdefault("FLASK_HTML_COMPRESS_LEVEL", 6)
+        app.config.setdefault("FLASK_HTML_COMPRESS_BROTLI_QUALITY", 5)
+        app.config.setdefault("FLASK_HTML_COMPRESS_MIN_SIZE", 500)
+        app.config.setdefault("FLASK_HTML_COMPRESS_CACHE_SIZE", 256)
+        app.config.setdefault("FLASK_HTML_STREAM_CHUNK_SIZE", 16384)
+        app.config.setdefault("FLASK_HTML_PATCH_CACHE_SIZE", 1024)
+        self.assets = create_asset_store(app.config)
+        self.__stored = LRUCache(app.config["FLASK_HTML_ASSET_CACHE_SIZE"])
+        self.max_age = app.config["FLASK_HTML_ASSET_MAX_AGE"]
+        self.fragment_cache = create_fragment_cache(app.config)
+        self.snapshots = LRUCache(app.config["FLASK_HTML_PATCH_CACHE_SIZE"])
+        if app.config["FLASK_HTML_COMPRESS"]:
+            self.compressor = Compressor(
+                app.config["FLASK_HTML_COMPRESS_LEVEL"],
+                app.config["FLASK_HTML_COMPRESS_BROTLI_QUALITY"],
+                app.config["FLASK_HTML_COMPRESS_MIN_SIZE"],
+                app.config["FLASK_HTML_COMPRESS_CACHE_SIZE"],
+                app.config["FLASK_HTML_ASSET_CACHE_SIZE"]
+            )
+        app.extensions["flask_html"] = self
+        from .core import configure_style_cache
+        configure_style_cache(app.config.get("SECRET_KEY", "123123"), app.config["FLASK_HTML_STYLE_CACHE_SIZE"])
+        app.register_blueprint(assets, url_prefix=app.config["FLASK_HTML_URL_PREFIX"])
+
+    def add_asset(self, content: str, ext: str) -> str:
+        """Store generated asset and return its URL
+
+        Args:
+            content (str): Content of asset
+            ext (str): Type of asset, "css" or "js"
+
+        Assets stored by this process are not looked up in the store again for _RECHECK
+        seconds, so repeated renders of a page do not read the store.
+
+        Returns:
+            str: URL of asset
+        """
+        digest = sha256(content.encode()).hexdigest()[:20]
+        key = "asset:{}.{}".format(digest, ext)
+        now = time.monotonic()
+        checked = self.__stored.get(key)
+        if checked is None or now - checked > _RECHECK:
+            if self.assets.get(key) is None:
+                self.assets.set(key, content)
+                if self.compressor is not None:
+                    self.compressor.precompress(content, (digest, ext))
+            self.__stored.set(key, now)
+        return url_for("flask_html.asset", digest=digest, ext=ext)
@@ -0,0 +1,220 @@
+import json
+import os
+import tempfile
+import time
+from hashlib import sha256
+from typing import Dict, List
+from .utils import LRUCache
+
+
+class FragmentCache:
+    """Base class of fragment cache backends
+
+    Backends store JSON serializable values and implement `get`, `set` and `delete`,
+    so a Redis-like store only has to map them to its own commands. Metrics and tag
+    invalidation are implemented here on top of these three methods: every tag has a
+    version, entries remember versions of their tags and are stale once one of them changes.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """Return stored value or None when it is missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict, ttl: int = None):
+        """Store value for ttl seconds, forever when ttl is None"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def load(self, key: str):
+        """Load rendered fragment
+
+        Args:
+            key (str): Key of fragment
+
+        Returns:
+            dict: Entry with "html", "styles" and "js" or None on miss
+        """
+        entry = self.get("fragment:" + key)
+        if entry is not None:
+            for tag, version in entry["tags"].items():
+                if self.get("tag:" + tag) != version:
+                    entry = None
+                    break
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key: str, entry: dict, ttl: int = None, tags: List[str] = []):
+        """Store rendered fragment
+
+        Args:
+            key (str): Key of fragment
+            entry (dict): Entry with "html", "styles" and "js"
+            ttl (int, optional): Time to live in seconds. Defaults to None.
+            tags (List[str], optional): Tags used for invalidation. Defaults to [].
+        """
+        versions = {}
+        for tag in tags:
+            version = self.get("tag:" + tag)
+            if version is None:
+                version = time.time()
+                self.set("tag:" + tag, version)
+            versions[tag] = version
+        entry = dict(entry, tags=versions)
+        self.set("fragment:" + key, entry, ttl)
+
+    def invalidate(self, key: str):
+        """Remove fragment by key"""
+        self.delete("fragment:" + key)
+
+    def invalidate_tag(self, tag: str):
+        """Make all fragments stored with tag stale"""
+        self.set("tag:" + tag, time.time())
+
+
+class MemoryFragmentCache(FragmentCache):
+    def __init__(self, maxsize: int = 1024):
+        """In-process fragment cache which evicts least recently used entries
+
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+        """
+        super().__init__()
+        self.__data = LRUCache(maxsize)
+
+    def get(self, key: str):
+        stored = self.__data.get(key)
+        if stored is None:
+            return None
+        expires, value = stored
+        if expires is not None and expires < time.time():
+            self.__data.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: dict, ttl: int = None):
+        expires = time.time() + ttl if ttl is not None else None
+        self.__data.set(key, (expires, value))
+
+    def delete(self, key: str):
+        self.__data.delete(key)
+
+
+class FileSystemFragmentCache(FragmentCache):
+    def __init__(self, directory: str, maxsize: int = None):
+        """Fragment cache which stores entries as JSON files, shared between processes
+
+        Files are touched when they are read, over maxsize entries the least recently
+        used files are removed. A new directory is created readable by its owner only.
+
+        Args:
+            directory (str): Directory of cache files
+            maxsize (int, optional): Maximum number of entries. Defaults to None, unbounded.
+        """
+        super().__init__()
+        self.directory = directory
+        self.maxsize = maxsize
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def __path(self, key: str):
+        return os.path.join(self.directory, sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, key: str):
+        try:
+            with open(self.__path(key), encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored["expires"] is not None and stored["expires"] < time.time():
+            self.delete(key)
+            return None
+        try:
+            os.utime(self.__path(key))
+        except OSError:
+            pass
+        return stored["value"]
+
+    def set(self, key: str, value: dict, ttl: int = None):
+        expires = time.time() + ttl if ttl is not None else None
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"expires": expires, "value": value}, f)
+        os.replace(tmp, self.__path(key))
+        if self.maxsize is not None:
+            self.__evict()
+
+    def __evict(self):
+        try:
+            paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")]
+        except OSError:
+            return
+        if len(paths) <= self.maxsize:
+            return
+        used = {}
+        for path in paths:
+            try:
+                used[path] = os.stat(path).st_mtime
+            except OSError:
+                pass
+        for path in sorted(used, key=used.get)[:len(used) - self.maxsize]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.__path(key))
+        except OSError:
+            pass
+
+
+def create_store(backend: object, maxsize: int, directory: str) -> FragmentCache:
+    """Create store of "memory" or "filesystem" backend, FragmentCache instances are used as they are
+
+    Args:
+        backend (str | FragmentCache): "memory", "filesystem" or instance
+        maxsize (int): Maximum number of entries
+        directory (str): Directory of filesystem backend
+    """
+    if isinstance(backend, FragmentCache):
+        return backend
+    if backend == "memory":
+        return MemoryFragmentCache(maxsize)
+    if backend == "filesystem":
+        return FileSystemFragmentCache(directory, maxsize)
+    raise ValueError("Unknown cache backend: {}".format(backend))
+
+
+def create_fragment_cache(config: Dict[str, object]) -> FragmentCache:
+    """Create fragment cache from app config
+
+    FLASK_HTML_FRAGMENT_CACHE is "memory", "filesystem" or a FragmentCache instance.
+    """
+    return create_store(
+        config.get("FLASK_HTML_FRAGMENT_CACHE", "memory"),
+        config.get("FLASK_HTML_FRAGMENT_CACHE_SIZE", 1024),
+        config.get("FLASK_HTML_FRAGMENT_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "flask_html")
+    )
+
+
+def create_asset_store(config: Dict[str, object]) -> FragmentCache:
+    """Create store of generated CSS and js from app config
+
+    FLASK_HTML_ASSET_STORE is "memory", "filesystem" or a FragmentCache instance. Pages link
+    assets by digest, so with several processes every one of them has to read the same store.
+    The filesystem store needs FLASK_HTML_ASSET_DIR, FlaskHTML sets it to the instance folder
+    of the app, a shared temp directory would let other local users serve their own js.
+    """
+    backend = config.get("FLASK_HTML_ASSET_STORE", "memory")
+    directory = config.get("FLASK_HTML_ASSET_DIR")
+    if backend == "filesystem" and not directory:
+        raise ValueError("FLASK_HTML_ASSET_DIR is required by filesystem asset store")
+    return create_store(backend, config.get("FLASK_HTML_ASSET_CACHE_SIZE", 1024), directory)
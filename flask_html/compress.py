@@ -0,0 +1,96 @@
+import gzip
+from hashlib import sha1
+from flask import current_app
+from .utils import LRUCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class Compressor:
+    def __init__(self, level: int = 6, brotli_quality: int = 5, min_size: int = 500, cache_size: int = 256, asset_cache_size: int = 1024):
+        """Compresses generated pages and assets with gzip or brotli
+
+        Compressed bodies are cached by digest of their content, so the same bytes are
+        never compressed twice. Assets are kept in their own cache, so pages unique to
+        a request do not evict them. Brotli is used when the `brotli` package is installed.
+
+        Args:
+            level (int, optional): Gzip compression level. Defaults to 6.
+            brotli_quality (int, optional): Brotli quality. Defaults to 5.
+            min_size (int, optional): Bodies smaller than this are sent uncompressed. Defaults to 500.
+            cache_size (int, optional): Maximum number of cached compressed bodies. Defaults to 256.
+            asset_cache_size (int, optional): Maximum number of assets with cached compressed bodies. Defaults to 1024.
+        """
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.min_size = min_size
+        self.encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+        self.cache = LRUCache(cache_size)
+        self.asset_cache = LRUCache(asset_cache_size * len(self.encodings))
+
+    def negotiate(self, request):
+        """Best encoding accepted by request or None"""
+        return request.accept_encodings.best_match(self.encodings)
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def compress_cached(self, data: bytes, encoding: str, key: object = None, cache: LRUCache = None):
+        """Compress data once and serve next calls with the same content from cache
+
+        Args:
+            data (bytes): Uncompressed data
+            encoding (str): "br" or "gzip"
+            key (object, optional): Cache key of data. Defaults to digest of data.
+            cache (LRUCache, optional): Cache of compressed data. Defaults to cache of pages.
+
+        Returns:
+            bytes: Compressed data
+        """
+        cache = cache if cache is not None else self.cache
+        key = (key if key is not None else sha1(data).digest(), encoding)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = self.compress(data, encoding)
+            cache.set(key, compressed)
+        return compressed
+
+    def precompress(self, body: str, key: object):
+        """Compress asset with every encoding into asset cache, before it is requested
+
+        Args:
+            body (str): Asset content
+            key (object): Cache key of asset
+        """
+        data = body.encode()
+        if len(data) >= self.min_size:
+            for encoding in self.encodings:
+                self.compress_cached(data, encoding, key, self.asset_cache)
+
+    def response(self, body: str, request, mimetype: str = "text/html", key: object = None, cache: LRUCache = None):
+        """Response with body compressed by encoding accepted by request
+
+        Args:
+            body (str): Response body
+            request (Request): Current request
+            mimetype (str, optional): Mimetype of body. Defaults to "text/html".
+            key (object, optional): Cache key of body. Defaults to digest of body.
+            cache (LRUCache, optional): Cache of compressed body. Defaults to cache of pages.
+
+        Returns:
+            Response: Flask response
+        """
+        data = body.encode()
+        resp = current_app.response_class(data, mimetype=mimetype)
+        resp.vary.add("Accept-Encoding")
+        encoding = self.negotiate(request) if len(data) >= self.min_size else None
+        if encoding is None:
+            return resp
+        resp.set_data(self.compress_cached(data, encoding, key, cache))
+        resp.content_encoding = encoding
+        return resp
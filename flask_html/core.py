@@ -1,7 +1,267 @@
+import asyncio
+import inspect
 from hashlib import sha256
 from . import Page
 from typing import Dict, List
-from flask import current_app
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from flask import current_app, g, has_app_context, has_request_context
+from functools import wraps
+from .cache import FragmentCache, MemoryFragmentCache
+from .utils import IdAllocator, LRUCache, Registry
+
+style_cache = LRUCache(4096)
+"""Process wide cache of class names of styles, keyed by declaration text"""
+
+handler_cache = LRUCache(4096)
+"""Process wide cache of keys of delegated event handlers, keyed by handler source"""
+
+DELEGATION_JS = (
+    "var fh=window.fh=window.fh||{h:{},e:{},on:function(t){if(this.e[t])return;this.e[t]=1;var a='data-fh-'+t;"
+    "document.addEventListener(t,function(ev){for(var el=ev.target;el&&el.getAttribute;el=el.parentNode){"
+    "var k=el.getAttribute(a);if(k&&fh.h[k])fh.h[k].call(el,ev);}},true);}};"
+)
+"""Runtime of delegated events: handler table and one capturing listener per event type at document root"""
+
+_id_scope = ContextVar("flask_html_id_scope")
+_global_ids = IdAllocator("g")
+_fragment_ids = IdAllocator("s")
+
+_secret = None
+_secret_configured = False
+_job_options = ContextVar("flask_html_job_options")
+
+def configure_style_cache(secret: str, maxsize: int = 4096):
+    """Set secret key used for class names of styles and size of style cache
+
+    Called once by FlaskHTML.init_app, so class names are computed without reading app config.
+    """
+    global _secret, _secret_configured
+    if not _secret_configured or secret != _secret or maxsize != style_cache.maxsize:
+        style_cache.clear()
+    _secret = secret
+    _secret_configured = True
+    style_cache.maxsize = maxsize
+
+def secret_key() -> str:
+    """SECRET_KEY used in class names of styles
+
+    Outside of app context, e.g. in workers of Page.render executor, the key is passed with the job.
+    """
+    options = _job_options.get(None)
+    if options is not None:
+        return options["secret"]
+    if _secret_configured:
+        return _secret
+    return current_app.config.get("SECRET_KEY", "123123")
+
+def style_class(styles: str) -> str:
+    """Class name of style declarations
+
+    Args:
+        styles (str): Rendered declarations of Style
+
+    Returns:
+        str: Class name
+    """
+    hash_code = style_cache.get(styles)
+    if hash_code is None:
+        hash_code = "o" + sha256("{secret}{styles}".format(secret=secret_key(), styles=styles).encode()).hexdigest()[:5]
+        style_cache.set(styles, hash_code)
+    return hash_code
+
+def next_id() -> str:
+    """Allocate id of element
+
+    Ids are counted per request, elements built outside of a request get ids with "g" prefix
+    and builders of fragments and parallel blocks allocate ids with a prefix of their own,
+    so ids baked into reused HTML never collide with ids of the current request.
+    """
+    allocator = _id_scope.get(None)
+    if allocator is None:
+        if not has_request_context():
+            return _global_ids()
+        allocator = g.get("_flask_html_ids")
+        if allocator is None:
+            allocator = g._flask_html_ids = IdAllocator()
+    return allocator()
+
+def _build_scoped(prefix: str, builder, *args):
+    """Call builder with ids of elements allocated with prefix"""
+    token = _id_scope.set(IdAllocator(prefix))
+    try:
+        return builder(*args)
+    finally:
+        _id_scope.reset(token)
+
+def _option(name: str, key: str, default: object):
+    """Option passed with current job of Page.render executor, else config value of current app
+
+    Args:
+        name (str): Name of option in job options
+        key (str): Config key
+        default (object): Value outside of app context
+    """
+    options = _job_options.get(None)
+    if options is not None:
+        return options[name]
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+def minify_default() -> bool:
+    """FLASK_HTML_MINIFY of current app or job, False outside of app context"""
+    return _option("minify", "FLASK_HTML_MINIFY", False)
+
+def atomic_css() -> bool:
+    """FLASK_HTML_ATOMIC_CSS of current app or job, False outside of app context"""
+    return _option("atomic", "FLASK_HTML_ATOMIC_CSS", False)
+
+def _longhands() -> Dict[str, tuple]:
+    sides = ("top", "right", "bottom", "left")
+    logical = ("block", "inline")
+    table = {}
+    for box in ("margin", "padding", "scroll-margin", "scroll-padding", "inset"):
+        prefix = "" if box == "inset" else box + "-"
+        table[box] = tuple(prefix + side for side in sides) + tuple("{}-{}".format(box, axis) for axis in logical)
+        for axis in logical:
+            table["{}-{}".format(box, axis)] = ("{}-{}-start".format(box, axis), "{}-{}-end".format(box, axis))
+    parts = ("width", "style", "color")
+    edges = sides + ("block-start", "block-end", "inline-start", "inline-end")
+    table["border"] = tuple("border-" + part for part in parts + sides + logical) + ("border-image",)
+    for part in parts:
+        table["border-" + part] = tuple("border-{}-{}".format(edge, part) for edge in edges)
+    for edge in edges:
+        table["border-" + edge] = tuple("border-{}-{}".format(edge, part) for part in parts)
+    for axis in logical:
+        table["border-" + axis] = tuple("border-{}-{}".format(axis, part) for part in parts) + ("border-{}-start".format(axis), "border-{}-end".format(axis))
+        for part in parts:
+            table["border-{}-{}".format(axis, part)] = ("border-{}-start-{}".format(axis, part), "border-{}-end-{}".format(axis, part))
+    table.update({
+        "border-radius": ("border-top-left-radius", "border-top-right-radius", "border-bottom-right-radius", "border-bottom-left-radius"),
+        "border-image": ("border-image-source", "border-image-slice", "border-image-width", "border-image-outset", "border-image-repeat"),
+        "outline": ("outline-color", "outline-style", "outline-width"),
+        "background": ("background-color", "background-image", "background-position", "background-size", "background-repeat",
+                       "background-attachment", "background-origin", "background-clip"),
+        "background-position": ("background-position-x", "background-position-y"),
+        "font": ("font-style", "font-variant", "font-weight", "font-stretch", "font-size", "line-height", "font-family"),
+        "font-variant": ("font-variant-caps", "font-variant-ligatures", "font-variant-numeric", "font-variant-east-asian",
+                         "font-variant-position", "font-variant-alternates"),
+        "text-decoration": ("text-decoration-line", "text-decoration-style", "text-decoration-color", "text-decoration-thickness"),
+        "text-emphasis": ("text-emphasis-style", "text-emphasis-color"),
+        "list-style": ("list-style-type", "list-style-position", "list-style-image"),
+        "flex": ("flex-grow", "flex-shrink", "flex-basis"),
+        "flex-flow": ("flex-direction", "flex-wrap"),
+        "grid": ("grid-template", "grid-auto-rows", "grid-auto-columns", "grid-auto-flow"),
+        "grid-template": ("grid-template-rows", "grid-template-columns", "grid-template-areas"),
+        "grid-area": ("grid-row", "grid-column"),
+        "grid-row": ("grid-row-start", "grid-row-end"),
+        "grid-column": ("grid-column-start", "grid-column-end"),
+        "grid-gap": ("gap",),
+        "gap": ("row-gap", "column-gap"),
+        "columns": ("column-width", "column-count"),
+        "column-rule": ("column-rule-width", "column-rule-style", "column-rule-color"),
+        "overflow": ("overflow-x", "overflow-y"),
+        "transition": ("transition-property", "transition-duration", "transition-timing-function", "transition-delay"),
+        "animation": ("animation-name", "animation-duration", "animation-timing-function", "animation-delay", "animation-iteration-count",
+                      "animation-direction", "animation-fill-mode", "animation-play-state"),
+        "mask": ("mask-image", "mask-mode", "mask-repeat", "mask-position", "mask-clip", "mask-origin", "mask-size", "mask-composite"),
+        "offset": ("offset-position", "offset-path", "offset-distance", "offset-rotate", "offset-anchor"),
+        "container": ("container-name", "container-type"),
+        "place-content": ("align-content", "justify-content"),
+        "place-items": ("align-items", "justify-items"),
+        "place-self": ("align-self", "justify-self"),
+    })
+    return table
+
+_LONGHANDS = _longhands()
+"""Properties set by shorthand properties, which may be shorthands themselves"""
+
+def _expand(name: str) -> frozenset:
+    longhands = _LONGHANDS.get(name)
+    return frozenset().union(*map(_expand, longhands)) if longhands else frozenset((name,))
+
+_COVERAGE = {name: _expand(name) for name in _LONGHANDS}
+
+def _coverage(name: str) -> frozenset:
+    """Longhand properties set by property, the property itself when it is not a known shorthand"""
+    return _COVERAGE.get(name) or frozenset((name,))
+
+def _is_longhand(name: str, shorthand: str) -> bool:
+    # prefixed and other properties missing from _LONGHANDS, -webkit-mask-image of -webkit-mask
+    parts = name.split("-")
+    words = shorthand.split("-")
+    if len(parts) <= len(words) or parts[0] != words[0]:
+        return False
+    parts = iter(parts)
+    return all(word in parts for word in words)
+
+def _overlapping(properties: List[str]) -> bool:
+    """True when two properties set the same longhand, like margin and margin-top or border-top and border-color"""
+    if len(properties) > 1 and "all" in properties:
+        return True
+    seen = set()
+    for name in properties:
+        coverage = _coverage(name)
+        if not seen.isdisjoint(coverage):
+            return True
+        seen.update(coverage)
+    return any(
+        name != shorthand and shorthand not in _LONGHANDS and _is_longhand(name, shorthand)
+        for shorthand in properties for name in properties
+    )
+
+def style_rules(style: "Style") -> tuple:
+    """(class name, declarations) pairs of Style
+
+    A single class holds all declarations of the style, in atomic mode every declaration
+    gets a class of its own, shared by all styles with the same property and value.
+    Order of atomic rules in the stylesheet depends on the order pages register them, so a
+    style setting two properties which set the same longhand (margin and margin-top, border-top
+    and border-color) keeps a single class even in atomic mode, its declarations are applied
+    in the written order.
+    """
+    if atomic_css() and not _overlapping(style.properties):
+        return tuple((style_class(declaration), declaration) for declaration in style.declarations)
+    styles = style.render()
+    return ((style_class(styles), styles),)
+
+def event_mode() -> str:
+    """FLASK_HTML_EVENTS of current app or job, "direct" outside of app context"""
+    return _option("events", "FLASK_HTML_EVENTS", "direct")
+
+def _run_job(options: dict, func, *args):
+    token = _job_options.set(options)
+    try:
+        return func(*args)
+    finally:
+        _job_options.reset(token)
+
+def _run_in_app_context(app, options: dict, func, *args):
+    with app.app_context():
+        return _run_job(options, func, *args)
+
+def submit(executor, func, *args) -> Future:
+    """Submit job of Page.render to executor
+
+    Config of current app used while elements are built and rendered (secret key, minify, atomic CSS,
+    event mode) is resolved on the request thread and passed with the job. Jobs of ThreadPoolExecutor
+    also run in the app context, so CachedFragment and lazy children using current_app render as they
+    do on the request thread; processes get the options only.
+    """
+    options = {"secret": secret_key(), "minify": minify_default(), "atomic": atomic_css(), "events": event_mode()}
+    if isinstance(executor, ThreadPoolExecutor) and has_app_context():
+        return executor.submit(_run_in_app_context, current_app._get_current_object(), options, func, *args)
+    return executor.submit(_run_job, options, func, *args)
+
+def handler_key(func: str) -> str:
+    """Key of delegated event handler, the same for the same handler source"""
+    key = handler_cache.get(func)
+    if key is None:
+        key = "h" + sha256(func.encode()).hexdigest()[:7]
+        handler_cache.set(func, key)
+    return key
+
 
 class Style:
     """Inline CSS style
@@ -17,11 +277,14 @@ class Style:
         Example:
             Style(color="red", padding_top="blue")
         """       
-        self.style = ""
+        self.declarations = []
+        self.properties = []
         for key, value in kwargs.items():
             if "_" in key:
                 key = key.replace("_", "-")
-            self.style+="{}:{};\n".format(key, value)
+            self.properties.append(key)
+            self.declarations.append("{}:{};\n".format(key, value))
+        self.style = "".join(self.declarations)
 
     def __str__(self):
         return self.render()
@@ -32,28 +295,34 @@ class Style:
     def render(self):
         return self.style
     
+_EMPTY_CLASSES = ()
+_EMPTY_PROPS = {}
+
 class Item:
     
-    item  = "<{tag} {classes} {id} {props}>{content}</{tag}>"
-    
-    page = None
-    __classes = []
-    __id = None
-    __styles = []
-    __tag = None
-    __elements = []
-    __props = {}
-    __js = None
+    __slots__ = ("page", "hash_code", "__classes", "__id", "__styles", "__tag", "__elements", "__props", "__js")
     
     def register_style(self):
+        """Register styles and js of element and its children on page of element
+
+        Pages collect them while the body is serialized, the walk is kept for code which
+        registers elements on a page by hand. Lazy children are not consumed.
+        """
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            item._collect(self.page)
+            _, elements, _ = item._parts()
+            if isinstance(elements, (list, tuple)):
+                stack.extend(child for child in reversed(elements) if isinstance(child, Item))
+
+    def _collect(self, page):
+        """Register own styles and js of element on page, called by the serializer for every node"""
         if self.__styles:
-            self.page.register_style(self.__styles[0], self.__styles[1])
+            for hash_code, styles in self.__styles:
+                page.register_style(hash_code, styles)
         if self.__js:
-            self.page.register_js(self.__js)
-        for i in range(len(self.__elements)):
-            if isinstance(self.__elements[i], Item):
-                self.__elements[i].page = self.page
-                self.__elements[i].register_style()
+            page.register_js(self.__js)
     
     def __init__(self, page: Page = None, classes: List[str] = [], id: str = None, style: Style = None, tag: str = "div", content: List[object] = [], props: Dict[str, str] = {}):
         """Base template for all HTML elements
@@ -68,57 +337,515 @@ class Item:
             props (Dict[str, str], optional): Tag rpoperties. Defaults to {}.
         """   
         
-        classes = [] if len(classes) == 0 else classes
-        props = {} if len(props) == 0 else props
-        
-        if page:
-            self.page = page
+        self.page = page
         self.__elements = content
-        self.__classes = classes
+        self.__styles = None
+        self.__js = None
         if style:
             _cl = self.__generate_style(style)
-            self.__classes.append(_cl)
-        if id:
-            self.__id = id
+            classes = [*classes, _cl]
+        self.__classes = classes if len(classes) > 0 else _EMPTY_CLASSES
+        self.__id = id
         self.__tag = tag
-        self.__props = props
+        self.__props = props if len(props) > 0 else _EMPTY_PROPS
         
     def __str__(self):
         return self.render()
     
-    def render(self):
+    def render(self, minify: bool = False):
+        return "".join(self.iter_render(minify))
+
+    def iter_render(self, minify: bool = False, collector = None):
+        """Render element as a stream of HTML chunks
+
+        The tree is walked once with an explicit stack instead of recursion, so every
+        chunk is produced exactly once regardless of the depth of the tree. Styles and js
+        of every node are registered on collector during the same walk.
+
+        Args:
+            minify (bool, optional): Omit spaces of empty classes, id and props in tags. Defaults to False.
+            collector (Page, optional): Page which collects styles and js of rendered elements. Defaults to None.
+
+        Yields:
+            str: Opening tags, text content and closing tags in document order
+        """
+        _open, elements, close = self._parts(minify)
+        if collector is not None:
+            self._collect(collector)
+        yield _open
+        stack = [(iter(elements), close)]
+        while stack:
+            elements, close = stack[-1]
+            for item in elements:
+                if isinstance(item, Item):
+                    _open, elements, close = item._parts(minify)
+                    if collector is not None:
+                        item._collect(collector)
+                    yield _open
+                    stack.append((iter(elements), close))
+                    break
+                if type(item) is not str:
+                    lazy = _lazy(item)
+                    if lazy is not None:
+                        stack.append((lazy, ""))
+                        break
+                yield str(item)
+            else:
+                stack.pop()
+                yield close
+
+    async def resolve_async(self, timeout: float = None, fallback: object = ""):
+        """Replace awaitable child elements with their results
+
+        All awaitables of the tree are awaited concurrently, elements they return are
+        resolved as soon as they arrive. Styles and js of returned elements are collected
+        when the page is serialized, like those of any other element.
+
+        Args:
+            timeout (float, optional): Timeout in seconds of every awaitable not wrapped in Await. Defaults to None.
+            fallback (object, optional): Content used when an awaitable times out. Defaults to "".
+        """
+        holes = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            elements = item.__elements
+            if not isinstance(elements, list):
+                continue
+            for index, child in enumerate(elements):
+                if isinstance(child, Item):
+                    stack.append(child)
+                elif isinstance(child, Await) or inspect.isawaitable(child):
+                    holes.append(_resolve_child(elements, index, child, timeout, fallback))
+        if holes:
+            await asyncio.gather(*holes)
+
+    def iter_render_parallel(self, executor, minify: bool = False, collector = None):
+        """Render element with its child elements rendered as separate jobs of executor
+
+        Jobs return styles and js of their elements with the HTML, they are registered on
+        collector in document order.
+
+        Args:
+            executor (Executor): concurrent.futures executor, with ProcessPoolExecutor child elements are pickled
+            minify (bool, optional): Omit spaces of empty classes, id and props in tags. Defaults to False.
+            collector (Page, optional): Page which collects styles and js of rendered elements. Defaults to None.
+
+        Yields:
+            str: Opening tag, rendered child elements and closing tag
+        """
+        jobs = []
+        for item in self.__elements:
+            if isinstance(item, Item) and not isinstance(item, ParallelBlock):
+                jobs.append(submit(executor, _render_item, item, minify))
+            else:
+                jobs.append(item)
+        if collector is not None:
+            self._collect(collector)
+        yield self._render_open(minify)
+        for job in jobs:
+            if isinstance(job, Future):
+                entry = job.result()
+                if collector is not None:
+                    for hash_code, styles in entry["styles"]:
+                        collector.register_style(hash_code, styles)
+                    for js in entry["js"]:
+                        collector.register_js(js)
+                yield entry["html"]
+            elif isinstance(job, Item):
+                yield from job.iter_render(minify, collector)
+            elif callable(job) or hasattr(job, "__next__"):
+                yield from _Group(job).iter_render(minify, collector)
+            else:
+                yield str(job)
+        yield "</" + self.__tag + ">"
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name.startswith("__"):
+                    name = "_" + cls.__name__.lstrip("_") + name
+                if name != "page" and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        self.page = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _parts(self, minify: bool = False):
+        """Opening tag, child elements and closing tag used by the serializer"""
+        return self._render_open(minify), self.__elements, "</" + self.__tag + ">"
+
+    def compile(self, minify: bool = False):
+        """Render element once and freeze it into a Fragment
+
+        Styles and js of the element and its children are collected once and registered by
+        the Fragment on every page it is used in. Slot elements stay dynamic and are filled
+        with Fragment.fill.
+
+        Args:
+            minify (bool, optional): Render minified HTML. Defaults to False.
+
+        Returns:
+            Fragment: Pre-rendered element
+        """
+        collector = _Collector()
+        parts = []
+        buffer = []
+        for chunk in self.iter_render(minify, collector):
+            if isinstance(chunk, _SlotMarker):
+                parts.append("".join(buffer))
+                parts.append(chunk)
+                buffer = []
+            else:
+                buffer.append(chunk)
+        parts.append("".join(buffer))
+        return Fragment(parts, list(collector.custom_classes.items()), list(collector.custom_js))
+
+    def _identity(self):
+        """Id, rendered attributes and js of element, used by DOM diffing"""
+        attrs = {}
+        if self.__classes:
+            attrs["class"] = " ".join(self.__classes)
+        if self.__id:
+            attrs["id"] = str(self.__id)
+        for key, value in self.__props.items():
+            attrs[str(key)] = str(value)
+        return (str(self.__id) if self.__id else None), attrs, self.__js
+
+    def _render_open(self, minify: bool = False):
         _id = ""
         if self.__id:
-            _id = "id='{}'".format(self.__id)
+            _id = "id='" + str(self.__id) + "'"
         _classes = ""
-        if len(self.__classes) > 0:
-            _classes = "class='"
-            for _class in self.__classes:
-                _classes += _class + " "
-            _classes = _classes.rstrip(" ")
-            _classes = _classes + "'"
+        if self.__classes:
+            _classes = "class='" + " ".join(self.__classes) + "'"
         _props = ""
-        if len(self.__props) > 0:
-            for key, value in self.__props.items():
-                _props += "{}='{}' ".format(key, value)
-            _props = _props.rstrip(" ")
-        _cnt = ""
-        for item in self.__elements:
-            _cnt += str(item)
-        return self.item.format(tag=self.__tag, classes=_classes, id=_id, content=_cnt, props=_props)
+        if self.__props:
+            _props = " ".join(["{}='{}'".format(key, value) for key, value in self.__props.items()])
+        if minify:
+            return "<" + " ".join([part for part in (self.__tag, _classes, _id, _props) if part]) + ">"
+        return "<" + self.__tag + " " + _classes + " " + _id + " " + _props + ">"
         
     
     def __generate_style(self, style: Style):
-        styles = style.render()
-        self.hash_code = "o" + sha256("{secret}{styles}".format(secret=current_app.config.get("SECRET_KEY", "123123"), styles=styles).encode()).hexdigest()[:5]
-        return self.__register_style(self.hash_code, styles)
-
-    def __register_style(self, hash_code: str, styles: str):
-        self.__styles = (hash_code, styles)
-        return hash_code
+        self.__styles = style_rules(style)
+        self.hash_code = " ".join(hash_code for hash_code, styles in self.__styles)
+        return self.hash_code
     
     def on(self, event, func):
+        """Attach js listener of event to element
+
+        With FLASK_HTML_EVENTS = "delegated" the element gets a `data-fh-<event>` attribute with
+        the key of the handler instead of an id and its own listener. Handlers are shared by
+        elements with the same source and dispatched by one listener per event type.
+
+        Args:
+            event (str): Event type, e.g. "click"
+            func (str): Body of js handler, `this` is the element
+        """
+        if event_mode() == "delegated":
+            key = handler_key(func)
+            self.__props = {**self.__props, "data-fh-" + event: key}
+            self.__js = (self.__js or "") + 'fh.h["{}"]=function(event){{ {} }};fh.on("{}");'.format(key, func, event)
+            return self
         if not self.__id:
-            self.__id = "o" + sha256("{secret}{tag}{event}{func}".format(secret=current_app.config.get("SECRET_KEY", "123123"), tag=str(self.__tag), event=event, func=func).encode()).hexdigest()[:5]
+            self.__id = next_id()
         self.__js = "document.getElementById('{}').addEventListener('{}', function() {{ {} }});".format(self.__id, event, func)
-        return self
\ No newline at end of file
+        return self
+
+def _lazy(child):
+    """Iterator over elements produced by generator, iterator or zero argument callable child, None for other children"""
+    if callable(child):
+        child = child()
+        if isinstance(child, (str, Item)) or not hasattr(child, "__iter__"):
+            return iter((child,))
+        return iter(child)
+    if hasattr(child, "__next__"):
+        return child
+    return None
+
+
+class _Group(Item):
+    """Transparent element rendering a single lazy child"""
+    __slots__ = ("__child",)
+
+    def __init__(self, child: object):
+        super().__init__(tag="")
+        self.__child = child
+
+    def _parts(self, minify: bool = False):
+        return "", [self.__child], ""
+
+
+class Await:
+    def __init__(self, awaitable, timeout: float = None, fallback: object = ""):
+        """Awaitable child element with its own timeout, resolved by Page.render_async
+
+        Args:
+            awaitable (Awaitable): Coroutine or future returning element
+            timeout (float, optional): Timeout in seconds. Defaults to None.
+            fallback (object, optional): Content used on timeout. Defaults to "".
+        """
+        self.awaitable = awaitable
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+async def _resolve_child(elements: List[object], index: int, child: object, timeout: float, fallback: object):
+    if isinstance(child, Await):
+        child, timeout, fallback = child.awaitable, child.timeout, child.fallback
+    try:
+        result = await asyncio.wait_for(child, timeout)
+    except asyncio.TimeoutError:
+        result = fallback
+    elements[index] = result
+    if isinstance(result, Item):
+        await result.resolve_async(timeout, fallback)
+
+
+class _Collector:
+    """Collects styles and js of elements outside of a Page"""
+    def __init__(self):
+        self.custom_classes = Registry()
+        self.custom_js = Registry()
+
+    def register_style(self, hash_code: str, style: str):
+        self.custom_classes.add(hash_code, style)
+
+    def register_js(self, js: str):
+        self.custom_js.add(js)
+
+
+class _SlotMarker(str):
+    """Empty chunk which marks position of Slot in rendered HTML"""
+    def __new__(cls, name: str, default: object = ""):
+        marker = super().__new__(cls, "")
+        marker.name = name
+        marker.default = default
+        return marker
+
+
+class Slot(Item):
+    __slots__ = ("__marker",)
+
+    def __init__(self, name: str, default: object = ""):
+        """Named placeholder for dynamic content of compiled element
+
+        Args:
+            name (str): Name of slot, used as keyword argument of Fragment.fill
+            default (object, optional): Content used when slot is not filled. Defaults to "".
+        """
+        super().__init__(tag="slot")
+        self.__marker = _SlotMarker(name, default)
+
+    def _parts(self, minify: bool = False):
+        return self.__marker, [], ""
+
+
+class Fragment(Item):
+    __slots__ = ("__fragment_parts", "__fragment_styles", "__fragment_js", "__values")
+
+    def __init__(self, parts: List[object], styles: List[tuple], js: List[str], values: Dict[str, object] = {}):
+        """Pre-rendered element created by Item.compile
+
+        Args:
+            parts (List[object]): Rendered HTML split by slot markers
+            styles (List[tuple]): Collected (class name, declarations) pairs
+            js (List[str]): Collected js
+            values (Dict[str, object], optional): Content of slots. Defaults to {}.
+        """
+        super().__init__(tag="")
+        self.__fragment_parts = parts
+        self.__fragment_styles = styles
+        self.__fragment_js = js
+        self.__values = values
+
+    def fill(self, **values):
+        """Fill slots of fragment
+
+        Returns:
+            Fragment: New fragment sharing pre-rendered HTML with this one
+        """
+        return Fragment(self.__fragment_parts, self.__fragment_styles, self.__fragment_js, values)
+
+    def cache_entry(self):
+        """Rendered HTML, styles and js of fragment in JSON serializable form, slots get default content"""
+        html = "".join(str(part.default) if isinstance(part, _SlotMarker) else part for part in self.__fragment_parts)
+        return {"html": html, "styles": [list(style) for style in self.__fragment_styles], "js": list(self.__fragment_js)}
+
+    def _collect(self, page):
+        for hash_code, styles in self.__fragment_styles:
+            page.register_style(hash_code, styles)
+        for js in self.__fragment_js:
+            page.register_js(js)
+
+    def _parts(self, minify: bool = False):
+        elements = []
+        for part in self.__fragment_parts:
+            if isinstance(part, _SlotMarker):
+                value = self.__values.get(part.name, part.default)
+                if isinstance(value, (list, tuple)):
+                    elements.extend(value)
+                else:
+                    elements.append(value)
+            else:
+                elements.append(part)
+        return "", elements, ""
+
+
+_fragment_cache = MemoryFragmentCache()
+
+
+class CachedFragment(Item):
+    __slots__ = ("__key", "__ttl", "__builder", "__tags", "__cache")
+
+    def __init__(self, key: str, ttl: int, builder, tags: List[str] = [], cache: FragmentCache = None):
+        """Element whose rendered HTML, styles and js are cached
+
+        On a cache hit the builder is not called and neither rendering nor style
+        registration of the subtree happens. The entry is loaded once per render, so
+        an element reused by several requests still follows ttl and invalidation.
+
+        Args:
+            key (str): Key of fragment in cache
+            ttl (int): Time to live in seconds, None to keep until invalidated
+            builder (Callable[[], Item]): Function which builds the element on a cache miss
+            tags (List[str], optional): Tags used for invalidation. Defaults to [].
+            cache (FragmentCache, optional): Cache backend. Defaults to cache of FlaskHTML extension.
+        """
+        super().__init__(tag="")
+        self.__key = key
+        self.__ttl = ttl
+        self.__builder = builder
+        self.__tags = tags
+        self.__cache = cache
+
+    def __load(self):
+        cache = self.__cache
+        memo = None
+        if has_app_context():
+            if cache is None:
+                state = current_app.extensions.get("flask_html")
+                cache = state.fragment_cache if state is not None else _fragment_cache
+            # _parts and _collect of one render share the entry, Page.build_blocks drops it before the next render
+            memo = g.setdefault("_flask_html_fragments", {})
+            entry = memo.get((id(cache), self.__key))
+            if entry is not None:
+                return entry
+        elif cache is None:
+            cache = _fragment_cache
+        entry = cache.load(self.__key)
+        if entry is None:
+            prefix = "c" + sha256(self.__key.encode()).hexdigest()[:6] + "-"
+            fragment = _build_scoped(prefix, self.__builder).compile(minify_default())
+            entry = fragment.cache_entry()
+            cache.store(self.__key, entry, self.__ttl, self.__tags)
+        if memo is not None:
+            memo[(id(cache), self.__key)] = entry
+        return entry
+
+    def _collect(self, page):
+        entry = self.__load()
+        for hash_code, styles in entry["styles"]:
+            page.register_style(hash_code, styles)
+        for js in entry["js"]:
+            page.register_js(js)
+
+    def _parts(self, minify: bool = False):
+        return "", [self.__load()["html"]], ""
+
+
+def _render_item(item: Item, minify: bool):
+    return item.compile(minify).cache_entry()
+
+
+def _build_block(builder, args: tuple, minify: bool, prefix: str):
+    return _build_scoped(prefix, builder, *args).compile(minify).cache_entry()
+
+
+class ParallelBlock(Item):
+    __slots__ = ("__builder", "__args", "__job", "__prefix")
+
+    def __init__(self, builder, *args):
+        """Element built and rendered by a job of Page.render executor
+
+        The builder runs on the worker, so with ProcessPoolExecutor only the builder and
+        its arguments are pickled. Styles and js registered by the built element are merged
+        into the page in document order. Blocks created in a request are started by Page.render,
+        without executor or outside of a request the element is built when it is rendered.
+
+        Example:
+            Body(page, elements=[ParallelBlock(build_report_section, section_id) for section_id in sections])
+            page.render(body, request, executor=pool)
+
+        Args:
+            builder (Callable[..., Item]): Module level function returning element
+            args: Arguments of builder
+        """
+        super().__init__(tag="")
+        self.__builder = builder
+        self.__args = args
+        self.__job = None
+        self.__prefix = next_id() + "-"
+        if has_request_context():
+            g.setdefault("_flask_html_blocks", []).append(self)
+
+    def start(self, executor, minify: bool):
+        """Submit builder to executor, or build element in place when executor is None"""
+        if executor is None:
+            self.__job = _build_block(self.__builder, self.__args, minify, self.__prefix)
+        else:
+            self.__job = submit(executor, _build_block, self.__builder, self.__args, minify, self.__prefix)
+
+    def entry(self, minify: bool = False):
+        """Rendered HTML, styles and js of built element"""
+        if self.__job is None:
+            self.start(None, minify)
+        if isinstance(self.__job, Future):
+            self.__job = self.__job.result()
+        return self.__job
+
+    def __getstate__(self):
+        # an element enclosing a started block is pickled for a process pool job,
+        # the block goes with its built entry instead of the Future of its own job
+        if isinstance(self.__job, Future):
+            self.__job = self.__job.result()
+        return super().__getstate__()
+
+    def _collect(self, page):
+        entry = self.entry()
+        for hash_code, styles in entry["styles"]:
+            page.register_style(hash_code, styles)
+        for js in entry["js"]:
+            page.register_js(js)
+
+    def _parts(self, minify: bool = False):
+        return "", [self.entry(minify)["html"]], ""
+
+
+def static_fragment(builder):
+    """Decorator which builds element once and reuses its compiled Fragment
+
+    Keyword arguments of decorated function fill Slot elements of the fragment.
+
+    Example:
+        @static_fragment
+        def navbar():
+            return Nav(elements=[A("/", elements=["Home"]), Slot("user")])
+
+        navbar(user=Span(current_user.name))
+    """
+    fragment = None
+    prefix = _fragment_ids() + "-"
+
+    @wraps(builder)
+    def wrapper(**values):
+        nonlocal fragment
+        if fragment is None:
+            fragment = _build_scoped(prefix, builder).compile(minify_default())
+        return fragment.fill(**values)
+    return wrapper
@@ -0,0 +1,290 @@
+import json
+import uuid
+from hashlib import sha1
+from typing import Dict, List
+from flask import current_app, url_for
+from .core import DELEGATION_JS, Item, _lazy
+
+CLIENT_HEADER = "X-Flask-HTML-Client"
+
+RUNTIME = """(function () {
+    var script = document.currentScript;
+    var client = script.getAttribute("data-client");
+    function node(id) { return id === null ? document.body : document.getElementById(id); }
+    function fragment(html) { var t = document.createElement("template"); t.innerHTML = html; return t.content; }
+    function apply(ops) {
+        ops.forEach(function (op) {
+            var el;
+            switch (op[0]) {
+            case "reload": location.reload(); break;
+            case "inner": node(op[1]).innerHTML = op[2]; break;
+            case "replace": el = node(op[1]); if (el) { el.replaceWith(fragment(op[2])); } break;
+            case "remove": el = node(op[1]); if (el) { el.remove(); } break;
+            case "insert": node(op[1]).insertBefore(fragment(op[3]), op[2] === null ? null : node(op[2])); break;
+            case "attrs":
+                el = node(op[1]);
+                Object.keys(op[2]).forEach(function (key) { el.setAttribute(key, op[2][key]); });
+                op[3].forEach(function (key) { el.removeAttribute(key); });
+                break;
+            case "css": el = document.createElement("style"); el.textContent = op[1]; document.head.appendChild(el); break;
+            case "js": new Function(op[1])(); break;
+            }
+        });
+    }
+    function refresh(url) {
+        var headers = {};
+        headers["%s"] = client;
+        return fetch(url || location.href, {headers: headers, credentials: "same-origin"})
+            .then(function (resp) { return resp.json(); })
+            .then(apply);
+    }
+    window.flaskHtml = {client: client, apply: apply, refresh: refresh};
+})();
+""" % CLIENT_HEADER
+
+
+class _Node:
+    """Fingerprint of element with id, or of the root element
+
+    Content of the element is hashed with descendants that have an id replaced
+    by a placeholder, so a change is attributed to the nearest element with an id.
+    """
+    __slots__ = ("key", "parent", "attrs", "js", "close", "children", "flat", "digest", "__hash")
+
+    def __init__(self, key: str, parent: str, attrs: Dict[str, str], js: str, close: str):
+        self.key = key
+        self.parent = parent
+        self.attrs = attrs
+        self.js = js
+        self.close = close
+        self.children = []
+        self.flat = True
+        self.digest = None
+        self.__hash = sha1()
+
+    def feed(self, text: str):
+        if text != "\0" and text and not text.isspace():
+            self.flat = False
+        self.__hash.update(text.encode())
+
+    def finish(self):
+        self.digest = self.__hash.digest()
+        self.__hash = None
+
+
+class Snapshot:
+    def __init__(self, content: Item, minify: bool = False, page=None):
+        """Structural fingerprint of rendered element tree
+
+        The tree is serialized once; the HTML of elements with an id is kept until
+        `release` is called, the fingerprint itself stores only hashes, attributes and ids.
+
+        Args:
+            content (Item): Root element, usually Body
+            minify (bool, optional): Render minified HTML. Defaults to False.
+            page (Page, optional): Page which collects styles and js of the tree, its registered classes and js are remembered. Defaults to None.
+        """
+        self.nodes = {}
+        self.ambiguous = False
+        self.__chunks = []
+        self.__spans = {}
+        self.__walk(content, minify, page)
+        self.classes = set(page.custom_classes) if page is not None else set()
+        self.scripts = set(page.custom_js) if page is not None else set()
+
+    def __walk(self, content: Item, minify: bool, page):
+        chunks = self.__chunks
+        _, attrs, js = content._identity()
+        _open, elements, close = content._parts(minify)
+        if page is not None:
+            content._collect(page)
+        root = self.nodes[None] = _Node(None, None, attrs, js, close)
+        chunks.append(_open)
+        stack = [(iter(elements), close, root, None)]
+        while stack:
+            elements, close, owner, key = stack[-1]
+            for item in elements:
+                if isinstance(item, Item):
+                    _id, attrs, js = item._identity()
+                    _open, children, _close = item._parts(minify)
+                    if page is not None:
+                        item._collect(page)
+                    children = iter(children)
+                    if _id is None:
+                        owner.feed(_open)
+                        stack.append((children, _close, owner, False))
+                    else:
+                        owner.feed("\0")
+                        owner.children.append(_id)
+                        if _id in self.nodes:
+                            self.ambiguous = True
+                        node = self.nodes[_id] = _Node(_id, owner.key, attrs, js, _close)
+                        self.__spans[_id] = [len(chunks), None]
+                        stack.append((children, _close, node, _id))
+                    chunks.append(_open)
+                    break
+                if type(item) is not str:
+                    lazy = _lazy(item)
+                    if lazy is not None:
+                        stack.append((lazy, "", owner, False))
+                        break
+                text = str(item)
+                owner.feed(text)
+                chunks.append(text)
+            else:
+                stack.pop()
+                if key is False:
+                    owner.feed(close)
+                    chunks.append(close)
+                    continue
+                owner.finish()
+                if key is None:
+                    self.__spans[None] = [1, len(chunks)]
+                    chunks.append(close)
+                else:
+                    chunks.append(close)
+                    self.__spans[key][1] = len(chunks)
+
+    def html(self, key: str = None) -> str:
+        """Outer HTML of element with id, inner HTML of the root element for None"""
+        start, end = self.__spans[key]
+        return "".join(self.__chunks[start:end])
+
+    def document(self) -> str:
+        """HTML of the whole tree"""
+        return "".join(self.__chunks)
+
+    def descendants(self, key: str):
+        """Ids of element and of all its descendants with an id"""
+        stack = [key]
+        while stack:
+            key = stack.pop()
+            yield key
+            stack.extend(reversed(self.nodes[key].children))
+
+    def release(self):
+        """Drop rendered HTML, only the fingerprint is kept"""
+        self.__chunks = []
+        self.__spans = {}
+
+
+def diff(old: Snapshot, new: Snapshot, page=None) -> List[list]:
+    """Compute patch which turns the DOM rendered from old snapshot into new one
+
+    Elements are matched by id. Changed content replaces the nearest element with an
+    id; children are inserted or removed one by one only when their parent contains
+    nothing but elements with an id, otherwise the parent is replaced.
+
+    Args:
+        old (Snapshot): Fingerprint of previous render
+        new (Snapshot): Snapshot of current render, with HTML not yet released
+        page (Page, optional): Page of new render, classes and js registered since the old render are included. Defaults to None.
+
+    Returns:
+        List[list]: Operations `["replace", id, html]`, `["inner", None, html]`, `["remove", id]`,
+        `["insert", parent, before, html]`, `["attrs", id, set, removed]`, `["css", rules]` and `["js", code]`
+    """
+    ops = []
+    rendered = []
+    moved = old.ambiguous or new.ambiguous or any(
+        key in old.nodes and old.nodes[key].parent != node.parent for key, node in new.nodes.items()
+    )
+    if moved:
+        _diff_attrs(ops, None, old.nodes[None], new.nodes[None])
+        ops.append(["inner", None, new.html(None)])
+        rendered.append(None)
+    else:
+        stack = [None]
+        while stack:
+            key = stack.pop()
+            a, b = old.nodes[key], new.nodes[key]
+            if a.js != b.js or a.close != b.close:
+                _replace(ops, rendered, new, key)
+                continue
+            _diff_attrs(ops, key, a, b)
+            if a.digest == b.digest and a.children == b.children:
+                stack.extend(reversed(b.children))
+                continue
+            common = [child for child in b.children if child in old.nodes]
+            if not (a.flat and b.flat) or common != [child for child in a.children if child in new.nodes]:
+                _replace(ops, rendered, new, key)
+                continue
+            for child in a.children:
+                if child not in new.nodes:
+                    ops.append(["remove", child])
+            # children are inserted from the last one, each in front of its next sibling
+            before = None
+            for child in reversed(b.children):
+                if child not in old.nodes:
+                    ops.append(["insert", key, before, new.html(child)])
+                    rendered.append(child)
+                before = child
+            stack.extend(reversed(common))
+    if page is not None:
+        rules = "".join(
+            ".{}{{{}}}".format(name, styles.replace("\n", ""))
+            for name, styles in page.custom_classes.items() if name not in old.classes
+        )
+        if rules:
+            ops.append(["css", rules])
+    scripts = {}
+    for key in rendered:
+        for child in new.descendants(key):
+            if new.nodes[child].js:
+                scripts[new.nodes[child].js] = None
+    if page is not None:
+        for js in page.custom_js:
+            if js not in old.scripts:
+                scripts[js] = None
+    if scripts:
+        js = "".join(scripts)
+        if page is not None and page.events == "delegated":
+            js = DELEGATION_JS + js
+        ops.append(["js", js])
+    return ops
+
+
+def _replace(ops: List[list], rendered: List[str], new: Snapshot, key: str):
+    ops.append(["inner" if key is None else "replace", key, new.html(key)])
+    rendered.append(key)
+
+
+def _diff_attrs(ops: List[list], key: str, a: _Node, b: _Node):
+    changed = {name: value for name, value in b.attrs.items() if a.attrs.get(name) != value}
+    removed = [name for name in a.attrs if name not in b.attrs]
+    if changed or removed:
+        ops.append(["attrs", key, changed, removed])
+
+
+def render_patch(page, content: Item, request):
+    """Render page, or a JSON patch against the previous render for requests of the client runtime
+
+    Args:
+        page (Page): Page of content
+        content (Item): Body element
+        request (Request): Current request
+    """
+    state = current_app.extensions.get("flask_html")
+    if state is None or request.args.get("css") or request.args.get("js"):
+        return page.render(content, request)
+    client = request.headers.get(CLIENT_HEADER)
+    page.build_blocks()
+    new = Snapshot(content, page.minify, page)
+    if client is None:
+        client = uuid.uuid4().hex
+        page.head_extra.append('<script src="{}" data-client="{}"></script>'.format(url_for("flask_html.runtime"), client))
+        body = new.document()
+        new.release()
+        state.snapshots.set((client, request.path), new)
+        return page.render(body, request)
+    old = state.snapshots.get((client, request.path))
+    ops = [["reload"]] if old is None else diff(old, new, page)
+    new.release()
+    state.snapshots.set((client, request.path), new)
+    body = json.dumps(ops, separators=(",", ":"))
+    if state.compressor is not None:
+        resp = state.compressor.response(body, request, "application/json")
+    else:
+        resp = current_app.response_class(body, mimetype="application/json")
+    resp.cache_control.no_store = True
+    return resp
@@ -0,0 +1,251 @@
+import json
+import time
+from threading import Lock
+from typing import List
+from . import core
+from .core import Item, _lazy
+from .signals import after_render, before_render
+
+_active = None
+
+
+def active_profiler():
+    """Running Profiler or None"""
+    return _active
+
+
+class Component(Item):
+    __slots__ = ("__name", "__item")
+
+    def __init__(self, name: str, item: object):
+        """Element which names its subtree in profiles, renders as the element itself
+
+        Example:
+            Body(page, elements=[Component("sidebar", build_sidebar())])
+
+        Args:
+            name (str): Name of component
+            item (object): Wrapped element
+        """
+        super().__init__(tag="", content=[item])
+        self.__name = name
+        self.__item = item
+
+    @property
+    def name(self):
+        return self.__name
+
+    def _parts(self, minify: bool = False):
+        return "", [self.__item], ""
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+class _Stats:
+    __slots__ = ("constructed", "rendered", "self_time", "time", "bytes")
+
+    def __init__(self):
+        self.constructed = 0
+        self.rendered = 0
+        self.self_time = 0.0
+        self.time = 0.0
+        self.bytes = 0
+
+    def as_dict(self):
+        return {
+            "constructed": self.constructed,
+            "rendered": self.rendered,
+            "self_time": self.self_time,
+            "time": self.time,
+            "bytes": self.bytes
+        }
+
+
+class Profiler:
+    def __init__(self):
+        """Opt-in profiler of element construction and page rendering
+
+        While running, it counts elements constructed per class, times style class
+        generation and whole pages, and serializes pages with an
+        instrumented serializer which measures render count, self time and output bytes per
+        class and per Component. It patches Item process wide, so use it in development
+        and benchmarks only. Executors passed to Page.render are ignored while profiling.
+
+        Example:
+            with Profiler() as profiler:
+                client.get("/")
+            profiler.dump_json("profile.json")
+            profiler.dump_collapsed("profile.folded")  # flamegraph.pl profile.folded > profile.svg
+        """
+        self.classes = {}
+        self.components = {}
+        self.phases = {"construct": 0.0, "style": 0.0, "render": 0.0, "page": 0.0}
+        self.pages = 0
+        self.stacks = {}
+        self.__lock = Lock()
+        self.__patched = None
+        self.__started = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another Profiler is running")
+        _active = self
+        init, rules = Item.__init__, core.style_rules
+        self.__patched = (init, rules)
+        profiler = self
+        clock = time.perf_counter
+
+        def __init__(item, *args, **kwargs):
+            start = clock()
+            init(item, *args, **kwargs)
+            profiler.__add_phase("construct", clock() - start)
+            profiler.__stats(profiler.classes, type(item).__name__).constructed += 1
+
+        def style_rules(style):
+            start = clock()
+            result = rules(style)
+            profiler.__add_phase("style", clock() - start)
+            return result
+
+        Item.__init__ = __init__
+        core.style_rules = style_rules
+        before_render.connect(self.__before_render)
+        after_render.connect(self.__after_render)
+
+    def stop(self):
+        global _active
+        if _active is not self:
+            return
+        Item.__init__, core.style_rules = self.__patched
+        before_render.disconnect(self.__before_render)
+        after_render.disconnect(self.__after_render)
+        _active = None
+
+    def __before_render(self, page, content=None):
+        self.__started[id(page)] = time.perf_counter()
+
+    def __after_render(self, page, content=None):
+        start = self.__started.pop(id(page), None)
+        if start is not None:
+            self.__add_phase("page", time.perf_counter() - start)
+            with self.__lock:
+                self.pages += 1
+
+    def __add_phase(self, phase: str, elapsed: float):
+        with self.__lock:
+            self.phases[phase] += elapsed
+
+    def __stats(self, table: dict, name: str) -> _Stats:
+        stats = table.get(name)
+        if stats is None:
+            stats = table.setdefault(name, _Stats())
+        return stats
+
+    def iter_render(self, item: Item, minify: bool = False, collector = None):
+        """Render element like Item.iter_render, recording time and output of every node
+
+        Time of a node is measured from its opening tag to its closing tag, so it includes
+        time the consumer spends between chunks; Page.render consumes them at once.
+        """
+        clock = time.perf_counter
+        render_start = clock()
+        names = []
+        stack = []
+        _open = self.__enter_node(item, minify, names, stack, clock, collector)
+        yield _open
+        while stack:
+            frame = stack[-1]
+            for child in frame[0]:
+                if isinstance(child, Item):
+                    yield self.__enter_node(child, minify, names, stack, clock, collector)
+                    break
+                if type(child) is not str:
+                    lazy = _lazy(child)
+                    if lazy is not None:
+                        frame[0] = _chain(lazy, frame[0])
+                        break
+                text = str(child)
+                frame[5] += len(text.encode())
+                yield text
+            else:
+                stack.pop()
+                yield frame[1]
+                elapsed = clock() - frame[2]
+                size = frame[5] + len(frame[1].encode())
+                self.__leave_node(frame[6], names, elapsed, elapsed - frame[3], size, size - frame[4])
+                names.pop()
+                if stack:
+                    stack[-1][3] += elapsed
+                    stack[-1][4] += size
+                    stack[-1][5] += size
+        self.__add_phase("render", clock() - render_start)
+
+    def __enter_node(self, item: Item, minify: bool, names: List[str], stack: list, clock, collector):
+        _open, elements, close = item._parts(minify)
+        if collector is not None:
+            item._collect(collector)
+        names.append(item.name if isinstance(item, Component) else type(item).__name__)
+        size = len(_open.encode())
+        # iterator, close, start, time of children, bytes of children, bytes, node
+        stack.append([iter(elements), close, clock(), 0.0, 0, size, item])
+        return _open
+
+    def __leave_node(self, item: Item, names: List[str], elapsed: float, self_time: float, size: int, self_size: int):
+        with self.__lock:
+            stats = self.__stats(self.classes, type(item).__name__)
+            stats.rendered += 1
+            stats.self_time += self_time
+            stats.time += elapsed
+            stats.bytes += self_size
+            if isinstance(item, Component):
+                stats = self.__stats(self.components, item.name)
+                stats.rendered += 1
+                stats.self_time += self_time
+                stats.time += elapsed
+                stats.bytes += size
+            key = ";".join(names)
+            self.stacks[key] = self.stacks.get(key, 0.0) + self_time
+
+    def stats(self) -> dict:
+        """Collected statistics
+
+        Returns:
+            dict: "pages", "phases" (seconds), "classes" and "components" with "constructed", "rendered",
+            "self_time" and "time" (seconds) and "bytes" (own output of classes, whole output of components)
+        """
+        with self.__lock:
+            return {
+                "pages": self.pages,
+                "phases": dict(self.phases),
+                "classes": {name: stats.as_dict() for name, stats in self.classes.items()},
+                "components": {name: stats.as_dict() for name, stats in self.components.items()}
+            }
+
+    def dump_json(self, path: str = None) -> str:
+        """Statistics as JSON, written to path when given"""
+        data = json.dumps(self.stats(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return data
+
+    def dump_collapsed(self, path: str = None) -> str:
+        """Self time of render stacks in microseconds as collapsed stack text of flamegraph.pl, written to path when given"""
+        with self.__lock:
+            lines = ["{} {}".format(key, int(value * 1000000)) for key, value in sorted(self.stacks.items())]
+        data = "\n".join(lines) + "\n"
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return data
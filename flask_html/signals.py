@@ -0,0 +1,9 @@
+from flask.signals import Namespace
+
+_signals = Namespace()
+
+before_render = _signals.signal("flask-html-before-render")
+"""Sent by Page before the body is serialized, with `content` keyword argument"""
+
+after_render = _signals.signal("flask-html-after-render")
+"""Sent by Page after the whole page is serialized, with `content` keyword argument"""
@@ -1,8 +1,12 @@
-from typing import Dict, List
+from collections.abc import Mapping
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Union
 from . import Page
-from .core import Style, Item
+from .core import Style, Item, style_rules
 
 class Body(Item):
+    __slots__ = ()
+
     def __init__(self, page: Page, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[object] = [], props: Dict[str, str] = {}):
         """Body HTML element
 
@@ -15,16 +19,19 @@ class Body(Item):
             props (Dict[str, str], optional): Additional tag properties. Defaults to {}.
         """        
         super().__init__(page=page, style=styles, classes=classes, id=id, tag="body", content=elements, props=props)
-        self.register_style()
 
 # -------------------- A ----------------------------
 
 class A(Item):
+    __slots__ = ()
+
     def __init__(self, href: str, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         props['href'] = href
         super().__init__(None, classes, id, styles, "a", elements, props)
 
 class Abbr(Item):
+    __slots__ = ()
+
     def __init__(self, title: str, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Abbr HTML element
 
@@ -40,6 +47,8 @@ class Abbr(Item):
         super().__init__(None, classes, id, styles, "abbr", elements, props)
 
 class Address(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Artice HTML element
 
@@ -53,6 +62,8 @@ class Address(Item):
         super().__init__(None, classes, id, styles, "address", elements, props)
 
 class Article(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Artice HTML element
 
@@ -66,6 +77,8 @@ class Article(Item):
         super().__init__(None, classes, id, styles, "article", elements, props)
 
 class Aside(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Aside HTML element
 
@@ -79,6 +92,8 @@ class Aside(Item):
         super().__init__(None, classes, id, styles, "aside", elements, props)
 
 class Audio(Item):
+    __slots__ = ()
+
     def __init__(self, src: str, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Audio HTML element
 
@@ -93,14 +108,16 @@ class Audio(Item):
         new_props = props.copy()
         new_props['src'] = src
         if 'controls' not in props:
-            props['controls']="controls"
+            props = dict(props, controls="controls")
         source = Item(None, [], [], [], "source", [], new_props)
-        elements.append(source)
+        elements = [*elements, source] if isinstance(elements, (list, tuple)) else [elements, source]
         super().__init__(None, classes, id, styles, "audio", elements, props)
 
 # -------------------- B ----------------------------
 
 class B(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """B HTML element (bold)
         
@@ -115,6 +132,8 @@ class B(Item):
         
 
 class Button(Item):
+    __slots__ = ()
+
     def __init__(self, title: str, _type: str="button", styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Button HTML element
         
@@ -131,6 +150,8 @@ class Button(Item):
         super().__init__(None, classes, id, styles, "button", elements, props)
 
 class Blockquote(Item):
+    __slots__ = ()
+
     def __init__(self, cite: str = None, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Blockquote HTML element
         
@@ -147,6 +168,8 @@ class Blockquote(Item):
         super().__init__(None, classes, id, styles, "blockquote", elements, props)
 
 class Br(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Br HTML element (line break)
         
@@ -161,6 +184,8 @@ class Br(Item):
 # -------------------- C ----------------------------
 
 class Canvas(Item):
+    __slots__ = ()
+
     def __init__(self, width: int, height: int, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Canvas HTML element
         
@@ -177,6 +202,8 @@ class Canvas(Item):
         super().__init__(None, classes, id, styles, "canvas", [], props)
         
 class Caption(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Caption HTML element
         
@@ -190,6 +217,8 @@ class Caption(Item):
         super().__init__(None, classes, id, styles, "caption", elements, props)
 
 class Cite(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Cite HTML element
         
@@ -203,6 +232,8 @@ class Cite(Item):
         super().__init__(None, classes, id, styles, "cite", elements, props)
 
 class Code(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Code HTML element
         
@@ -216,6 +247,8 @@ class Code(Item):
         super().__init__(None, classes, id, styles, "code", elements, props)
 
 class Col(Item):
+    __slots__ = ()
+
     def __init__(self, span: int = None, width: int = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Col HTML element
         
@@ -234,6 +267,8 @@ class Col(Item):
         super().__init__(None, classes, id, styles, "col", [], props)
 
 class Colgroup(Item):
+    __slots__ = ()
+
     def __init__(self, span: int = None, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Colgroup HTML element
         
@@ -250,6 +285,8 @@ class Colgroup(Item):
         super().__init__(None, classes, id, styles, "colgroup", elements, props)
 
 class Div(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Div HTML element
 
@@ -263,6 +300,8 @@ class Div(Item):
         super().__init__(None, classes, id, styles, "div", elements, props)
 
 class Datagrid(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Datagrid HTML element
         
@@ -276,6 +315,8 @@ class Datagrid(Item):
         super().__init__(None, classes, id, styles, "datagrid", elements, props)
 
 class Dd(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Dd HTML element
         
@@ -289,6 +330,8 @@ class Dd(Item):
         super().__init__(None, classes, id, styles, "dd", elements, props)
 
 class Del(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Del HTML element
         
@@ -302,6 +345,8 @@ class Del(Item):
         super().__init__(None, classes, id, styles, "del", elements, props)
 
 class Details(Item):
+    __slots__ = ()
+
     def __init__(self, open: bool = False, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Details HTML element
         
@@ -318,6 +363,8 @@ class Details(Item):
         super().__init__(None, classes, id, styles, "details", elements, props)
 
 class Dl(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Dl HTML element
         
@@ -331,6 +378,8 @@ class Dl(Item):
         super().__init__(None, classes, id, styles, "dl", elements, props)
 
 class Dt(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Dt HTML element
         
@@ -344,6 +393,8 @@ class Dt(Item):
         super().__init__(None, classes, id, styles, "dt", elements, props)
 
 class Em(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Em HTML element
         
@@ -357,6 +408,8 @@ class Em(Item):
         super().__init__(None, classes, id, styles, "em", elements, props)
 
 class Embed(Item):
+    __slots__ = ()
+
     def __init__(self, src: str, type: str, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Embed HTML element
         
@@ -374,6 +427,8 @@ class Embed(Item):
         super().__init__(None, classes, id, styles, "embed", elements, props)
 
 class Fieldset(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Fieldset HTML element
         
@@ -387,6 +442,8 @@ class Fieldset(Item):
         super().__init__(None, classes, id, styles, "fieldset", elements, props)
         
 class Figcaption(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Figcaption HTML element
         
@@ -400,6 +457,8 @@ class Figcaption(Item):
         super().__init__(None, classes, id, styles, "figcaption", elements, props)
 
 class Figure(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Figure HTML element
         
@@ -413,6 +472,8 @@ class Figure(Item):
         super().__init__(None, classes, id, styles, "figure", elements, props)
 
 class Form(Item):
+    __slots__ = ()
+
     def __init__(self, method: str, action: str, enctype: str = "multipart/form-data", styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Form HTML element
         
@@ -432,6 +493,8 @@ class Form(Item):
         super().__init__(None, classes, id, styles, "form", elements, props)
         
 class Footer(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Footer HTML element
         
@@ -445,6 +508,8 @@ class Footer(Item):
         super().__init__(None, classes, id, styles, "footer", elements, props)
 
 class H1(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """H1 HTML element
         
@@ -458,6 +523,8 @@ class H1(Item):
         super().__init__(None, classes, id, styles, "h1", elements, props)
         
 class H2(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """H2 HTML element
         
@@ -471,6 +538,8 @@ class H2(Item):
         super().__init__(None, classes, id, styles, "h2", elements, props)
         
 class H3(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """H3 HTML element
         
@@ -484,6 +553,8 @@ class H3(Item):
         super().__init__(None, classes, id, styles, "h3", elements, props)
 
 class H4(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """H4 HTML element
         
@@ -497,6 +568,8 @@ class H4(Item):
         super().__init__(None, classes, id, styles, "h4", elements, props)
 
 class H5(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """H5 HTML element
         
@@ -510,6 +583,8 @@ class H5(Item):
         super().__init__(None, classes, id, styles, "h5", elements, props)
 
 class H6(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """H6 HTML element
         
@@ -523,6 +598,8 @@ class H6(Item):
         super().__init__(None, classes, id, styles, "h6", elements, props)
 
 class Header(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Header HTML element
         
@@ -536,6 +613,8 @@ class Header(Item):
         super().__init__(None, classes, id, styles, "header", elements, props)
 
 class Hr(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Hr HTML element
         
@@ -550,6 +629,8 @@ class Hr(Item):
 # ------------------ I ------------------ #
 
 class I(Item):
+    __slots__ = ()
+
     def __init__(self, text: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """I HTML element
         
@@ -564,6 +645,8 @@ class I(Item):
         super().__init__(None, classes, id, styles, "i", elements, props)
 
 class Iframe(Item):
+    __slots__ = ()
+
     def __init__(self, src: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Iframe HTML element
         
@@ -579,6 +662,8 @@ class Iframe(Item):
         super().__init__(None, classes, id, styles, "iframe", [], props)
 
 class Img(Item):
+    __slots__ = ()
+
     def __init__(self, src: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Img HTML element
         
@@ -594,6 +679,8 @@ class Img(Item):
         super().__init__(None, classes, id, styles, "img", [], props)
         
 class Input(Item):
+    __slots__ = ()
+
     def __init__(self, _type: str, name: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Input HTML element
         
@@ -610,6 +697,8 @@ class Input(Item):
         super().__init__(None, classes, id, styles, "input", [], props)
         
 class Ins(Item):
+    __slots__ = ()
+
     def __init__(self, text: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Ins HTML element
         
@@ -624,6 +713,8 @@ class Ins(Item):
         super().__init__(text, classes, id, styles, "ins", elements, props)
         
 class Label(Item):
+    __slots__ = ()
+
     def __init__(self, _for: str = None, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Label HTML element
         
@@ -639,6 +730,8 @@ class Label(Item):
         super().__init__(None, classes, id, styles, "label", elements, props)
 
 class Li(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Li HTML element
         
@@ -652,6 +745,8 @@ class Li(Item):
         super().__init__(None, classes, id, styles, "li", elements, props)
 
 class Legend(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Legend HTML element
         
@@ -665,6 +760,8 @@ class Legend(Item):
         super().__init__(None, classes, id, styles, "legend", elements, props)
 
 class Link(Item):
+    __slots__ = ()
+
     def __init__(self, href: str, rel: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Link HTML element
         
@@ -684,6 +781,8 @@ class Link(Item):
 # ---------------- N ----------------
 
 class Nav(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Nav HTML element
         
@@ -700,6 +799,8 @@ class Nav(Item):
 # ---------------- O ----------------
 
 class Ol(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Ol HTML element
         
@@ -713,6 +814,8 @@ class Ol(Item):
         super().__init__(None, classes, id, styles, "ol", elements, props)
         
 class Option(Item):
+    __slots__ = ()
+
     def __init__(self, value: str, text: str = None, selected: bool = False, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Option HTML element
         
@@ -732,6 +835,8 @@ class Option(Item):
         super().__init__(None, classes, id, styles, "option", elements, props)
         
 class Optgroup(Item):
+    __slots__ = ()
+
     def __init__(self, label: str, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Optgroup HTML element
         
@@ -749,6 +854,8 @@ class Optgroup(Item):
 # ---------------- P ----------------
 
 class P(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """P HTML element
         
@@ -762,6 +869,8 @@ class P(Item):
         super().__init__(None, classes, id, styles, "p", elements, props)
 
 class Param(Item):
+    __slots__ = ()
+
     def __init__(self, name: str, value: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Param HTML element
         
@@ -778,6 +887,8 @@ class Param(Item):
         super().__init__(None, classes, id, styles, "param", [], props)
 
 class Pre(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Pre HTML element
         
@@ -791,6 +902,8 @@ class Pre(Item):
         super().__init__(None, classes, id, styles, "pre", elements, props)
 
 class Progress(Item):
+    __slots__ = ()
+
     def __init__(self, value: int, max: int = 100, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Progress HTML element
         
@@ -809,6 +922,8 @@ class Progress(Item):
 # ---------------- Q ----------------
 
 class Q(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, cite: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Q HTML element
         
@@ -826,6 +941,8 @@ class Q(Item):
 # ---------------- S ----------------
 
 class S(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """S HTML element
         
@@ -839,6 +956,8 @@ class S(Item):
         super().__init__(None, classes, id, styles, "s", [text], props)
 
 class Small(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Small HTML element
         
@@ -852,6 +971,8 @@ class Small(Item):
         super().__init__(None, classes, id, styles, "small", [text], props)
 
 class Script(Item):
+    __slots__ = ()
+
     def __init__(self, src: str = None, text: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Script HTML element
         
@@ -871,6 +992,8 @@ class Script(Item):
         super().__init__(None, classes, id, styles, "script", elements, props)
         
 class Section(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Section HTML element
         
@@ -884,6 +1007,8 @@ class Section(Item):
         super().__init__(None, classes, id, styles, "section", elements, props)
 
 class Select(Item):
+    __slots__ = ()
+
     def __init__(self, options: List[Option] = [], styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Select HTML element
         
@@ -899,6 +1024,8 @@ class Select(Item):
         super().__init__(None, classes, id, styles, "select", options, props)
 
 class Source(Item):
+    __slots__ = ()
+
     def __init__(self, src: str, media: str = None, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Source HTML element
         
@@ -915,6 +1042,8 @@ class Source(Item):
         super().__init__(None, classes, id, styles, "source", [], props)
         
 class Span(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Span HTML element
         
@@ -928,6 +1057,8 @@ class Span(Item):
         super().__init__(None, classes, id, styles, "span", [text], props)
 
 class Strong(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Strong HTML element
         
@@ -941,6 +1072,8 @@ class Strong(Item):
         super().__init__(None, classes, id, styles, "strong", [text], props)
         
 class Style(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Style HTML element
         
@@ -954,6 +1087,8 @@ class Style(Item):
         super().__init__(None, classes, id, styles, "style", [text], props)
 
 class Sub(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Sub HTML element
         
@@ -967,6 +1102,8 @@ class Sub(Item):
         super().__init__(None, classes, id, styles, "sub", [text], props)
         
 class Sup(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Sup HTML element
         
@@ -980,6 +1117,8 @@ class Sup(Item):
         super().__init__(None, classes, id, styles, "sup", [text], props)
 
 class Strong(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Strong HTML element
         
@@ -995,6 +1134,8 @@ class Strong(Item):
 # ------------------ T ------------------
 
 class Table(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Table HTML element
         
@@ -1007,8 +1148,101 @@ class Table(Item):
             props (Dict[str, str], optional): Additional tag properties. Defaults to {}.
         """
         super().__init__(None, classes, id, styles, "table", elements, props)
+
+    @classmethod
+    def from_rows(cls, columns: List[Union[str, tuple]], rows: Iterable[object], row_classes: Union[List[str], Callable[[object], List[str]]] = [], cell_formatter: Callable[[str, object], str] = None, column_styles: Dict[str, Style] = {}, batch_size: int = 500, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
+        """Table rendered directly from rows of data, without Tr and Td elements per cell
+
+        Rows are consumed while the table is rendered and serialized in batches, so
+        with Page.stream they are never held in memory at once.
+
+        Example:
+            Table.from_rows(["name", ("price", "Price, $")], cursor, column_styles={"price": Style(text_align="right")})
+
+        Args:
+            columns (List[str | tuple]): Column keys, or (key, title) pairs
+            rows (Iterable[object]): Dicts and records (namedtuples, DB-API rows with keys, numpy records) looked up by key,
+                objects with attributes named by keys, or plain tuples and lists in the order of columns
+            row_classes (List[str] | Callable[[object], List[str]], optional): Class names of rows, or function of row returning them. Defaults to [].
+            cell_formatter (Callable[[str, object], str], optional): Function of column key and value returning cell content. Defaults to str of value.
+            column_styles (Dict[str, Style], optional): Styles of columns by key, registered once per page. Defaults to {}.
+            batch_size (int, optional): Number of rows serialized at once. Defaults to 500.
+            styles (Style, optional): Inline css styles. Defaults to None.
+            classes (List[str], optional): List of class names. Defaults to [].
+            id (str, optional): Unique ID. Defaults to None.
+            props (Dict[str, str], optional): Additional tag properties. Defaults to {}.
+        """
+        return RowTable(columns, rows, row_classes, cell_formatter, column_styles, batch_size, styles, classes, id, props)
+
+
+def _row_getter(row: object, keys: List[str]) -> Callable[[object], object]:
+    """Function returning values of columns of rows of the same type as row"""
+    if isinstance(row, Mapping) or hasattr(row, "keys") or getattr(getattr(row, "dtype", None), "names", None):
+        return lambda row: [row[key] for key in keys]
+    if hasattr(row, "_fields") or not hasattr(row, "__getitem__"):
+        return lambda row: [getattr(row, key) for key in keys]
+    return lambda row: row
+
+
+class RowTable(Table):
+    __slots__ = ("__columns", "__rows", "__row_classes", "__cell_formatter", "__column_styles", "__batch_size")
+
+    def __init__(self, columns: List[Union[str, tuple]], rows: Iterable[object], row_classes: Union[List[str], Callable[[object], List[str]]] = [], cell_formatter: Callable[[str, object], str] = None, column_styles: Dict[str, Style] = {}, batch_size: int = 500, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
+        """Table rendered from rows of data, created by Table.from_rows"""
+        super().__init__(styles, classes, id, [], props)
+        self.__columns = [column if isinstance(column, tuple) else (column, column) for column in columns]
+        self.__rows = rows
+        self.__row_classes = row_classes
+        self.__cell_formatter = cell_formatter
+        self.__column_styles = {key: style_rules(style) for key, style in column_styles.items()}
+        self.__batch_size = batch_size
+
+    def _collect(self, page):
+        super()._collect(page)
+        for rules in self.__column_styles.values():
+            for hash_code, styles in rules:
+                page.register_style(hash_code, styles)
+
+    def _parts(self, minify: bool = False):
+        _open, elements, close = super()._parts(minify)
+        return _open, self.__batches(minify), close
+
+    def __batches(self, minify: bool):
+        keys = [key for key, title in self.__columns]
+        cells = []
+        header = []
+        for key, title in self.__columns:
+            column_classes = [hash_code for hash_code, styles in self.__column_styles.get(key, ())]
+            cells.append(Td("", classes=column_classes)._render_open(minify))
+            header.append(Th(title, classes=column_classes))
+        yield Thead(elements=[Tr(elements=header)]).render(minify) + Tbody()._render_open(minify)
+        formatter = self.__cell_formatter
+        row_classes = self.__row_classes
+        tr = None if callable(row_classes) else Tr(classes=row_classes)._render_open(minify)
+        rows = iter(self.__rows)
+        getters = {}
+        while True:
+            batch = list(islice(rows, self.__batch_size))
+            if not batch:
+                break
+            buffer = []
+            for row in batch:
+                getter = getters.get(type(row))
+                if getter is None:
+                    getter = getters[type(row)] = _row_getter(row, keys)
+                values = getter(row)
+                buffer.append(tr if tr is not None else Tr(classes=row_classes(row))._render_open(minify))
+                for td, key, value in zip(cells, keys, values):
+                    buffer.append(td)
+                    buffer.append(str(value) if formatter is None else formatter(key, value))
+                    buffer.append("</td>")
+                buffer.append("</tr>")
+            yield "".join(buffer)
+        yield "</tbody>"
         
 class Tbody(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Tbody HTML element
         
@@ -1023,6 +1257,8 @@ class Tbody(Item):
         super().__init__(None, classes, id, styles, "tbody", elements, props)
 
 class Td(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Td HTML element
         
@@ -1036,6 +1272,8 @@ class Td(Item):
         super().__init__(None, classes, id, styles, "td", [text], props)
         
 class Tfoot(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Tfoot HTML element
         
@@ -1049,6 +1287,8 @@ class Tfoot(Item):
         super().__init__(None, classes, id, styles, "tfoot", elements, props)
 
 class Th(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Th HTML element
         
@@ -1062,6 +1302,8 @@ class Th(Item):
         super().__init__(None, classes, id, styles, "th", [text], props)
         
 class Thead(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Thead HTML element
         
@@ -1075,6 +1317,8 @@ class Thead(Item):
         super().__init__(None, classes, id, styles, "thead", elements, props)
 
 class Title(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Title HTML element
         
@@ -1088,6 +1332,8 @@ class Title(Item):
         super().__init__(None, classes, id, styles, "title", [text], props)
         
 class Tr(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Tr HTML element
         
@@ -1103,6 +1349,8 @@ class Tr(Item):
 # ------------------ U ----------------
         
 class Ul(Item):
+    __slots__ = ()
+
     def __init__(self, styles: Style = None, classes: List[str] = [], id: str = None, elements: List[Item] = [], props: Dict[str, str] = {}):
         """Ul HTML element
         
@@ -1116,6 +1364,8 @@ class Ul(Item):
         super().__init__(None, classes, id, styles, "ul", elements, props)
 
 class U(Item):
+    __slots__ = ()
+
     def __init__(self, text: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """U HTML element
         
@@ -1129,6 +1379,8 @@ class U(Item):
         super().__init__(None, classes, id, styles, "u", [text], props)
 
 class Video(Item):
+    __slots__ = ()
+
     def __init__(self, src: str, styles: Style = None, classes: List[str] = [], id: str = None, props: Dict[str, str] = {}):
         """Video HTML element
         
@@ -0,0 +1,106 @@
+import warnings
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """Thread safe bounded mapping which evicts least recently used entries
+
+    Args:
+        maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__data = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            try:
+                value = self.__data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+
+    def delete(self, key):
+        with self.__lock:
+            self.__data.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key):
+        return key in self.__data
+
+    def __len__(self):
+        return len(self.__data)
+
+
+class Registry(dict):
+    """Insertion ordered de-duplicating registry with bounded size
+
+    Entries over `maxsize` are dropped with a warning instead of growing without limit.
+
+    Args:
+        maxsize (int, optional): Maximum number of entries. Defaults to 10000.
+    """
+    def __init__(self, maxsize: int = 10000):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def add(self, key, value=None):
+        if key in self:
+            return
+        if len(self) >= self.maxsize:
+            warnings.warn("flask_html registry is full ({} entries), {!r} is dropped".format(self.maxsize, key), RuntimeWarning)
+            return
+        self[key] = value
+
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def base36(number: int) -> str:
+    digits = ""
+    while True:
+        number, digit = divmod(number, 36)
+        digits = _DIGITS[digit] + digits
+        if not number:
+            return digits
+
+
+class IdAllocator:
+    """Allocates element ids: prefix followed by a base 36 counter
+
+    Ids depend only on the order of allocation, so the same tree gets the same ids on every render.
+
+    Args:
+        prefix (str, optional): Prefix of ids. Defaults to "f".
+    """
+    __slots__ = ("prefix", "count", "__lock")
+
+    def __init__(self, prefix: str = "f"):
+        self.prefix = prefix
+        self.count = 0
+        self.__lock = Lock()
+
+    def __call__(self) -> str:
+        with self.__lock:
+            number = self.count
+            self.count += 1
+        return self.prefix + base36(number)
@@ -117,6 +117,9 @@ setup(
     install_requires=[
         'Flask'
     ],
+    extras_require={
+        'brotli': ['brotli']
+    },
     classifiers=[
         'Environment :: Web Environment',
         'Intended Audience :: Developers',
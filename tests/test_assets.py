@@ -0,0 +1,105 @@
+import os
+import re
+
+from flask import Flask, request
+
+from flask_html import FlaskHTML, Head, Page
+from flask_html.cache import FileSystemFragmentCache, MemoryFragmentCache
+from flask_html.core import Style
+from flask_html.tags import Body, Button, Div
+
+
+def create_app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    FlaskHTML(app)
+
+    @app.route("/")
+    def index():
+        page = Page(Head("t"))
+        body = Body(page, elements=[Div(styles=Style(color="red"), elements=[Button("b").on("click", "go()")])])
+        return page.render(body, request)
+
+    return app
+
+
+def asset_links(html):
+    return re.findall(r'(?:href|src)="(/_flask_html/[0-9a-f]+\.(?:css|js))"', html)
+
+
+def test_assets_are_served_by_other_workers(tmp_path):
+    first = create_app(FLASK_HTML_ASSET_STORE="filesystem", FLASK_HTML_ASSET_DIR=str(tmp_path))
+    second = create_app(FLASK_HTML_ASSET_STORE="filesystem", FLASK_HTML_ASSET_DIR=str(tmp_path))
+    links = asset_links(first.test_client().get("/").get_data(as_text=True))
+    assert len(links) == 2
+    client = second.test_client()
+    css = client.get(links[0])
+    assert css.status_code == 200 and css.mimetype == "text/css" and "color:red" in css.get_data(as_text=True)
+    js = client.get(links[1])
+    assert js.status_code == 200 and "go()" in js.get_data(as_text=True)
+    assert client.get(links[0], headers={"If-None-Match": css.get_etag()[0]}).status_code == 304
+
+
+def test_memory_store_and_unknown_assets():
+    app = create_app()
+    assert isinstance(app.extensions["flask_html"].assets, MemoryFragmentCache)
+    client = app.test_client()
+    links = asset_links(client.get("/").get_data(as_text=True))
+    assert client.get(links[0]).status_code == 200
+    assert create_app().test_client().get(links[0]).status_code == 404
+    assert client.get("/_flask_html/0123456789abcdef0123.txt").status_code == 404
+
+
+def test_filesystem_store_is_bounded_and_private(tmp_path):
+    directory = str(tmp_path / "assets")
+    store = FileSystemFragmentCache(directory, 2)
+    assert os.stat(directory).st_mode & 0o077 == 0
+    store.set("a", "first")
+    store.set("b", "second")
+    for name in os.listdir(directory):
+        os.utime(os.path.join(directory, name), (0, 0))
+    assert store.get("a") == "first"
+    store.set("c", "third")
+    assert len(os.listdir(directory)) == 2
+    assert store.get("b") is None and store.get("a") == "first" and store.get("c") == "third"
+
+
+def test_filesystem_store_defaults_to_instance_folder(tmp_path):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config["FLASK_HTML_ASSET_STORE"] = "filesystem"
+    FlaskHTML(app)
+    assert app.extensions["flask_html"].assets.directory == os.path.join(str(tmp_path), "flask_html_assets")
+
+
+def test_repeated_renders_do_not_read_store():
+    class Counting(MemoryFragmentCache):
+        reads = 0
+
+        def get(self, key):
+            Counting.reads += 1
+            return super().get(key)
+
+    client = create_app(FLASK_HTML_ASSET_STORE=Counting(16)).test_client()
+    client.get("/")
+    reads = Counting.reads
+    for _ in range(5):
+        client.get("/")
+    assert reads == 2 and Counting.reads == reads
+
+
+def test_assets_are_compressed_once_apart_from_pages():
+    app = create_app(FLASK_HTML_COMPRESS=True, FLASK_HTML_COMPRESS_MIN_SIZE=0, FLASK_HTML_COMPRESS_CACHE_SIZE=2)
+    compressor = app.extensions["flask_html"].compressor
+    client = app.test_client()
+    links = asset_links(client.get("/").get_data(as_text=True))
+    compressed = []
+    compress = compressor.compress
+    compressor.compress = lambda data, encoding: compressed.append(data) or compress(data, encoding)
+    with app.test_request_context("/", headers={"Accept-Encoding": "gzip"}):
+        for n in range(10):
+            compressor.response("page {}".format(n), request)
+    del compressed[:]
+    for link in links:
+        resp = client.get(link, headers={"Accept-Encoding": "gzip"})
+        assert resp.content_encoding == "gzip"
+    assert compressed == []
@@ -0,0 +1,139 @@
+import json
+import re
+
+import pytest
+from flask import Flask, request
+
+from flask_html import FlaskHTML, Head, Page
+from flask_html.core import Style
+from flask_html.diff import CLIENT_HEADER, Snapshot, diff
+from flask_html.tags import Body, Button, Div, Li, P, Ul
+
+_ID = re.compile(r"id='([^']+)'")
+
+
+def ul(*ids, text=None):
+    return Ul(id="list", elements=[Li(id=key, elements=[text or key]) for key in ids])
+
+
+def children(snapshot, key="list"):
+    return list(snapshot.nodes[key].children)
+
+
+def apply(snapshot, ops, key="list"):
+    """Order of children of key after the client runtime applied ops"""
+    order = children(snapshot, key)
+    for op in ops:
+        if op[0] == "remove":
+            order.remove(op[1])
+        elif op[0] == "insert" and op[1] == key:
+            new = _ID.search(op[3]).group(1)
+            order.insert(len(order) if op[2] is None else order.index(op[2]), new)
+        elif op[0] in ("replace", "inner"):
+            raise AssertionError("unexpected {}".format(op[0]))
+    return order
+
+
+@pytest.mark.parametrize("old, new", [
+    (["a"], ["a", "b", "c"]),
+    (["c"], ["a", "b", "c"]),
+    (["a", "d"], ["a", "b", "c", "d"]),
+    ([], ["a", "b"]),
+    (["a", "b", "c"], ["a", "c"]),
+    (["a", "b"], ["b", "c", "d"]),
+    (["b", "d"], ["a", "b", "c", "d", "e"]),
+])
+def test_insert_and_remove_keep_order(old, new):
+    before = Snapshot(Body(None, elements=[ul(*old)]))
+    after = Snapshot(Body(None, elements=[ul(*new)]))
+    ops = diff(before, after)
+    assert apply(before, ops) == new
+    assert all(op[0] in ("insert", "remove") for op in ops)
+
+
+def test_adjacent_inserts_are_anchored_on_next_sibling():
+    before = Snapshot(Body(None, elements=[ul("a")]))
+    after = Snapshot(Body(None, elements=[ul("a", "b", "c")]))
+    ops = diff(before, after)
+    assert [op[:3] for op in ops] == [["insert", "list", None], ["insert", "list", "c"]]
+    assert "'c'" in ops[0][3] and "'b'" in ops[1][3]
+
+
+def test_unchanged_tree_has_no_ops():
+    tree = lambda: Body(None, elements=[ul("a", "b"), P(id="p", elements=["text"])])
+    assert diff(Snapshot(tree()), Snapshot(tree())) == []
+
+
+def test_changed_text_replaces_nearest_element_with_id():
+    before = Snapshot(Body(None, elements=[Div(id="box", elements=[P(elements=["1"])])]))
+    after = Snapshot(Body(None, elements=[Div(id="box", elements=[P(elements=["2"])])]))
+    ops = diff(before, after)
+    assert ops == [["replace", "box", after.html("box")]]
+    assert ">2<" in ops[0][2]
+
+
+def test_changed_attributes():
+    before = Snapshot(Body(None, elements=[P(id="p", classes=["a"], props={"title": "x"})]))
+    after = Snapshot(Body(None, elements=[P(id="p", classes=["b"])]))
+    assert diff(before, after) == [["attrs", "p", {"class": "b"}, ["title"]]]
+
+
+def test_reordered_children_replace_parent():
+    before = Snapshot(Body(None, elements=[ul("a", "b")]))
+    after = Snapshot(Body(None, elements=[ul("b", "a")]))
+    assert diff(before, after) == [["replace", "list", after.html("list")]]
+
+
+def test_moved_element_replaces_body():
+    before = Snapshot(Body(None, elements=[Div(id="x", elements=[P(id="p")]), Div(id="y")]))
+    after = Snapshot(Body(None, elements=[Div(id="x"), Div(id="y", elements=[P(id="p")])]))
+    assert diff(before, after) == [["inner", None, after.html(None)]]
+
+
+def test_inserted_elements_bring_their_js():
+    before = Snapshot(Body(None, elements=[ul("a")]))
+    button = Button("b", id="btn").on("click", "go()")
+    after = Snapshot(Body(None, elements=[Ul(id="list", elements=[Li(id="a", elements=["a"]), Li(id="b", elements=[button])])]))
+    ops = diff(before, after)
+    assert ops[0][:3] == ["insert", "list", None]
+    assert ops[-1] == ["js", "document.getElementById('btn').addEventListener('click', function() { go() });"]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    FlaskHTML(app)
+    state = {"items": ["a"], "color": "red"}
+
+    @app.route("/")
+    def index():
+        page = Page(Head("t"))
+        body = Body(page, elements=[
+            Ul(id="list", elements=[Li(id=key, elements=[key]) for key in state["items"]]),
+            P(id="p", styles=Style(color=state["color"]), elements=["x"]),
+        ])
+        return page.patch(body, request)
+
+    app.state = state
+    return app
+
+
+def test_patch_endpoint(app):
+    client = app.test_client()
+    html = client.get("/").get_data(as_text=True)
+    token = re.search(r'data-client="([^"]+)"', html).group(1)
+    app.state["items"] = ["a", "b", "c"]
+    app.state["color"] = "blue"
+    resp = client.get("/", headers={CLIENT_HEADER: token})
+    ops = json.loads(resp.get_data(as_text=True))
+    assert resp.cache_control.no_store
+    assert [op[:3] for op in ops if op[0] == "insert"] == [["insert", "list", None], ["insert", "list", "c"]]
+    assert any(op[0] == "attrs" and op[1] == "p" for op in ops)
+    assert any(op[0] == "css" and "color:blue" in op[1] for op in ops)
+    resp = client.get("/", headers={CLIENT_HEADER: token})
+    assert json.loads(resp.get_data(as_text=True)) == []
+
+
+def test_patch_unknown_client_reloads(app):
+    resp = app.test_client().get("/", headers={CLIENT_HEADER: "unknown"})
+    assert json.loads(resp.get_data(as_text=True)) == [["reload"]]
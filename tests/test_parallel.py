@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from flask import Flask, current_app, request
+
+from flask_html import Head, Page
+from flask_html.core import CachedFragment, ParallelBlock, Style
+from flask_html.tags import Body, Button, Div, P
+
+
+def build(n):
+    return Div(styles=Style(color="blue", padding="{}px".format(n)), elements=[
+        Button("b{}".format(n)).on("click", "go({})".format(n))
+    ])
+
+
+def panel(n):
+    return Div(styles=Style(margin="{}px".format(n)), elements=[P(elements=["panel {}".format(n)])])
+
+
+def body(page):
+    return Body(page, elements=[
+        panel(1),
+        ParallelBlock(build, 1),
+        Div(elements=[P(elements=["nested"]), ParallelBlock(build, 2)]),
+        panel(3),
+    ])
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture(scope="module")
+def processes():
+    with ProcessPoolExecutor(2) as pool:
+        yield pool
+
+
+@pytest.fixture(scope="module")
+def threads():
+    with ThreadPoolExecutor(4) as pool:
+        yield pool
+
+
+def render(app, build_body, executor=None):
+    with app.test_request_context("/"):
+        page = Page(Head("t"))
+        html = page.render(build_body(page), request, executor=executor)
+        return html, list(page.custom_classes.items()), list(page.custom_js)
+
+
+@pytest.mark.parametrize("pool", ["processes", "threads"])
+def test_executor_renders_like_serial_render(app, pool, request):
+    executor = request.getfixturevalue(pool)
+    assert render(app, body, executor) == render(app, body)
+
+
+def test_top_level_block_in_process_pool(app, processes):
+    html, classes, js = render(app, lambda page: Body(page, elements=[ParallelBlock(build, 7)]), processes)
+    assert ">b7</button>" in html
+    assert [styles for name, styles in classes] == ["color:blue;\npadding:7px;\n"]
+    assert len(js) == 1 and "go(7)" in js[0]
+
+
+def test_nested_block_in_process_pool(app, processes):
+    html, classes, js = render(app, lambda page: Body(page, elements=[Div(elements=[Div(elements=[ParallelBlock(build, 8)])])]), processes)
+    assert ">b8</button>" in html
+    assert [styles for name, styles in classes] == ["color:blue;\npadding:8px;\n"]
+    assert len(js) == 1 and "go(8)" in js[0]
+
+
+def test_thread_jobs_run_in_app_context(app, threads):
+    built = []
+
+    def sidebar():
+        built.append(1)
+        return P(styles=Style(color="red"), elements=["cached"])
+
+    def build_body(page):
+        return Body(page, elements=[
+            Div(elements=[CachedFragment("sidebar", 60, sidebar)]),
+            Div(elements=[lambda: P(elements=[current_app.name])]),
+        ])
+
+    html, classes, js = render(app, build_body, threads)
+    assert ">cached<" in html and ">{}<".format(app.name) in html
+    assert classes == [(classes[0][0], "color:red;\n")]
+    render(app, build_body, threads)
+    assert built == [1]
+
+
+@pytest.mark.parametrize("pool", ["processes", "threads"])
+def test_blocks_follow_app_config(app, pool, request):
+    app.config.update(FLASK_HTML_ATOMIC_CSS=True, FLASK_HTML_EVENTS="delegated")
+    executor = request.getfixturevalue(pool)
+    html, classes, js = render(app, lambda page: Body(page, elements=[Div(elements=[ParallelBlock(build, 4)])]), executor)
+    assert [styles for name, styles in classes] == ["color:blue;\n", "padding:4px;\n"]
+    assert "data-fh-click=" in html and "id=" not in html
+    assert js == [js[0]] and js[0].startswith('fh.h["')
@@ -0,0 +1,94 @@
+import gc
+import threading
+import tracemalloc
+
+import pytest
+from flask import Flask, request
+
+from flask_html import Head, Page
+from flask_html.core import Style
+from flask_html.tags import Body, Button, Div
+from flask_html.utils import Registry
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def render(x):
+    page = Page(Head("Title"))
+    body = Body(page, elements=[
+        Div(styles=Style(padding="{}px".format(x % 50)), elements=[
+            Button("Button", styles=Style(color="red")).on("click", "alert({})".format(x % 50))
+        ])
+    ])
+    page.render(body, request)
+    return page
+
+
+def traced_size():
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, "*flask_html*")])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def test_memory_is_flat_across_requests(app):
+    def serve(start, count):
+        for x in range(start, start + count):
+            with app.test_request_context("/"):
+                render(x)
+
+    serve(0, 200)
+    tracemalloc.start()
+    try:
+        serve(200, 500)
+        before = traced_size()
+        serve(700, 2000)
+        after = traced_size()
+    finally:
+        tracemalloc.stop()
+    assert after - before < 16 * 1024
+
+
+def test_pages_of_separate_requests_do_not_share_registries(app):
+    with app.test_request_context("/"):
+        first = render(1)
+    with app.test_request_context("/"):
+        second = render(2)
+    assert len(first.custom_classes) == len(second.custom_classes) == 2
+    assert set(first.custom_classes) != set(second.custom_classes)
+    assert list(first.custom_js) == ["document.getElementById('f0').addEventListener('click', function() { alert(1) });"]
+    assert list(second.custom_js) == ["document.getElementById('f0').addEventListener('click', function() { alert(2) });"]
+
+
+def test_pages_of_concurrent_threads_do_not_share_registries(app):
+    barrier = threading.Barrier(8)
+    pages = {}
+
+    def serve(x):
+        with app.test_request_context("/"):
+            barrier.wait()
+            pages[x] = [render(x) for _ in range(20)]
+
+    threads = [threading.Thread(target=serve, args=(x,)) for x in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for x, rendered in pages.items():
+        for page in rendered:
+            assert len(page.custom_classes) == 2
+            assert "padding:{}px;\n".format(x) in page.custom_classes.values()
+            assert len(page.custom_js) == 1
+            assert "alert({})".format(x) in list(page.custom_js)[0]
+
+
+def test_registry_is_bounded():
+    registry = Registry(2)
+    registry.add("a", 1)
+    registry.add("a", 2)
+    registry.add("b")
+    with pytest.warns(RuntimeWarning):
+        registry.add("c")
+    assert dict(registry) == {"a": 1, "b": None}
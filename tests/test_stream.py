@@ -0,0 +1,51 @@
+import pytest
+from flask import Flask
+
+from flask_html import FlaskHTML, Head, Page
+from flask_html.core import Style
+from flask_html.tags import Body, Button, Div, P
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["FLASK_HTML_STREAM_CHUNK_SIZE"] = 512
+    FlaskHTML(app)
+    return app
+
+
+def test_head_is_sent_before_body_is_rendered(app):
+    rendered = []
+
+    def rows():
+        for n in range(100):
+            rendered.append(n)
+            yield P(styles=Style(padding="{}px".format(n % 10)), elements=["row {}".format(n)])
+
+    with app.test_request_context("/"):
+        page = Page(Head("t"))
+        chunks = page.stream(Body(page, elements=[rows]))
+        first = next(chunks)
+        assert rendered == []
+        assert "<!DOCTYPE html>" in first and "</head>" in first and first.rstrip().endswith("<body>")
+        assert list(chunks)
+        assert len(rendered) == 100
+
+
+def test_styles_are_inlined_before_first_use(app):
+    def rows():
+        for n in range(60):
+            yield Div(styles=Style(margin="{}px".format(n)), elements=[
+                Button("b{}".format(n)).on("click", "go({})".format(n))
+            ])
+
+    with app.test_request_context("/"):
+        page = Page(Head("t"))
+        chunks = list(page.stream(Body(page, elements=[rows])))
+    html = "".join(chunks)
+    body = chunks[1:]
+    assert len(body) > 2 and all(chunk.lstrip().startswith("<style") for chunk in body[:-1])
+    for name, styles in page.custom_classes.items():
+        assert html.index(".{}".format(name)) < html.index("class='{}'".format(name))
+    assert html.count("<script") == 1 and html.rindex("<script") > html.rindex("b59</button>")
+    assert html.rstrip().endswith("</html>")
@@ -0,0 +1,43 @@
+import pytest
+from flask import Flask
+
+from flask_html.core import Style, _overlapping, style_rules
+
+
+@pytest.mark.parametrize("properties", [
+    ["margin", "margin-top"],
+    ["border-top", "border-color"],
+    ["border", "border-left-width"],
+    ["columns", "column-width"],
+    ["grid-area", "grid-row-start"],
+    ["grid-area", "grid-column"],
+    ["font", "line-height"],
+    ["inset", "left"],
+    ["background", "background-position-x"],
+    ["padding-inline", "padding-inline-start"],
+    ["all", "color"],
+])
+def test_overlapping_properties(properties):
+    assert _overlapping(properties)
+    assert _overlapping(list(reversed(properties)))
+
+
+@pytest.mark.parametrize("properties", [
+    ["color", "padding"],
+    ["margin-top", "margin-bottom"],
+    ["border-top", "border-bottom"],
+    ["border-color", "border-width"],
+    ["grid-row", "grid-column"],
+    ["flex", "flex-flow"],
+])
+def test_separate_properties(properties):
+    assert not _overlapping(properties)
+
+
+def test_atomic_mode_keeps_overlapping_style_in_one_class():
+    app = Flask(__name__)
+    app.config["FLASK_HTML_ATOMIC_CSS"] = True
+    with app.app_context():
+        assert len(style_rules(Style(color="red", padding="1px"))) == 2
+        rules = style_rules(Style(border_top="1px solid", border_color="red"))
+        assert len(rules) == 1 and rules[0][1] == "border-top:1px solid;\nborder-color:red;\n"